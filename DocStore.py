@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+import threading
+
+from spacy.tokens import DocBin
+
+
+class DocStore:
+    """
+    Persistent store of processed resume Docs next to their parse results.
+
+    Each resume's Doc is serialized with spaCy's DocBin (token texts and the
+    annotations the parser reads), together with its text, whether it was parsed
+    in fast mode, the parse_information() result and the digest of the heading
+    CSV it was segmented with. ResumeParser.resegment() uses this to apply new
+    heading aliases to an archive without extracting the PDFs or running the
+    pipeline again. The heading aliases of every digest in use are kept too, so
+    the aliases that changed since a resume was segmented can be worked out.
+
+    Args:
+        path: sqlite file; None keeps the store in memory for this process only
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS docs (path TEXT PRIMARY KEY, text TEXT NOT NULL, doc BLOB NOT NULL,
+                                             fast INTEGER NOT NULL, digest TEXT NOT NULL, details TEXT);
+            CREATE INDEX IF NOT EXISTS docs_digest ON docs (digest);
+            CREATE TABLE IF NOT EXISTS headings (digest TEXT PRIMARY KEY, aliases TEXT NOT NULL);
+        ''')
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    def put(self, path, doc, fast, digest, details):
+        """
+        Store a resume's Doc and parse result, replacing an earlier entry for path.
+
+        Args:
+            path: Key of the resume, normally its file path
+            doc: Processed Doc as handed to ResumeParser
+            fast: Whether the Doc is tokenizer-only (ResumeParser fast mode)
+            digest: ResumeParser.read_section_info()[0] at parse time
+            details: parse_information() dict
+        """
+        data = DocBin(docs=[doc]).to_bytes()
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO docs (path, text, doc, fast, digest, details) '
+                            'VALUES (?, ?, ?, ?, ?, ?)', (path, doc.text, data, int(fast), digest, json.dumps(details)))
+            self.db.commit()
+
+    def get(self, path, vocab):
+        """
+        Return (doc, fast, digest, details) for path, or None if it is not stored.
+
+        Args:
+            vocab: Vocab the Doc is restored into, e.g. ResumeParser.nlp.vocab
+        """
+        with self.lock:
+            row = self.db.execute('SELECT doc, fast, digest, details FROM docs WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            return None
+        return self.load_doc(row[0], vocab), bool(row[1]), row[2], json.loads(row[3])
+
+    @staticmethod
+    def load_doc(data, vocab):
+        return next(DocBin().from_bytes(data).get_docs(vocab))
+
+    def entries(self, digest=None, page_size=500):
+        """
+        Yield (path, text, digest) of every stored resume, or only of those not
+        segmented with digest. Rows are read page_size at a time, so the caller may
+        update entries while iterating.
+        """
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.db.execute('SELECT rowid, path, text, digest FROM docs WHERE rowid > ? AND digest != ? '
+                                       'ORDER BY rowid LIMIT ?', (last, digest or '', page_size)).fetchall()
+            if not rows:
+                return
+            for rowid, path, text, entry_digest in rows:
+                yield path, text, entry_digest
+            last = rows[-1][0]
+
+    def update(self, path, digest, details=None):
+        """Record that path was segmented with digest, with its new result if it changed."""
+        with self.lock:
+            if details is None:
+                self.db.execute('UPDATE docs SET digest = ? WHERE path = ?', (digest, path))
+            else:
+                self.db.execute('UPDATE docs SET digest = ?, details = ? WHERE path = ?',
+                                (digest, json.dumps(details), path))
+            self.db.commit()
+
+    def save_headings(self, digest, aliases):
+        """Keep the (section, alias) pairs of a heading CSV digest, see headings()."""
+        with self.lock:
+            self.db.execute('INSERT OR IGNORE INTO headings (digest, aliases) VALUES (?, ?)',
+                            (digest, json.dumps(sorted(aliases))))
+            self.db.commit()
+
+    def headings(self, digest):
+        """Return the set of (section, alias) pairs saved for digest, or None if unknown."""
+        with self.lock:
+            row = self.db.execute('SELECT aliases FROM headings WHERE digest = ?', (digest,)).fetchone()
+        return None if row is None else {tuple(pair) for pair in json.loads(row[0])}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate detection for resume texts with MinHash and locality sensitive hashing.
+
+    Each text is reduced to the set of its word shingles and summarized by a MinHash
+    signature; the share of equal signature values estimates the Jaccard similarity
+    of two texts. Signatures are split into bands, and only resumes sharing at least
+    one band are compared, so a lookup does not scan the whole index. A resume that
+    was re-exported by another PDF producer or had a line edited is still found,
+    which a cache keyed on the file's bytes (see ParseCache) misses.
+
+    Signatures, the band table and (optionally) each resume's parse result are kept
+    in sqlite, so the index carries over between batch runs.
+
+    Args:
+        path: sqlite file for the index; None keeps it in memory for this run only
+        threshold: Estimated Jaccard similarity from which two texts count as duplicates
+        num_perm: Number of MinHash values per signature
+        shingle_size: Number of words per shingle
+        seed: Seed of the MinHash permutations, fixed per index file
+
+    The band layout is derived from the threshold when the index is created and
+    kept with it; reopening it with another threshold changes only which candidates
+    are accepted.
+
+    Raises:
+        ValueError: If path holds an index built with a different num_perm,
+        shingle_size or seed
+    """
+
+    # Mersenne prime for the universal hashes (a * x + b) % PRIME over 32-bit shingle hashes
+    PRIME = (1 << 31) - 1
+
+    def __init__(self, path=None, threshold=0.9, num_perm=128, shingle_size=5, seed=1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = self.band_layout(threshold, num_perm)
+        self.lock = threading.Lock()
+
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, self.PRIME, size=num_perm).astype(np.uint64)
+        self.b = generator.randint(0, self.PRIME, size=num_perm).astype(np.uint64)
+
+        # pairs found by this run: path -> (path of the earlier resume, estimated similarity)
+        self.matches = {}
+        self.lookups = 0
+        self.duplicates = 0
+        self.reused = 0
+
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path or ':memory:', check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS signatures (id INTEGER PRIMARY KEY, path TEXT, signature BLOB NOT NULL,
+                                                   fingerprint TEXT, details TEXT);
+            CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, hash BLOB NOT NULL, id INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, hash);
+        ''')
+        self.check_meta()
+
+    def check_meta(self):
+        # signatures are only comparable when they were built with the same permutations
+        params = {'num_perm': self.num_perm, 'shingle_size': self.shingle_size, 'seed': self.seed}
+        stored = dict(self.db.execute('SELECT name, value FROM meta').fetchall())
+        if not stored:
+            params['bands'] = self.bands
+            self.db.executemany('INSERT INTO meta (name, value) VALUES (?, ?)',
+                                [(name, json.dumps(value)) for name, value in params.items()])
+            self.db.commit()
+            return
+        for name, value in params.items():
+            if json.loads(stored.get(name, 'null')) != value:
+                raise ValueError(f"Index {self.path} was built with {name}={stored.get(name)}, not {value}")
+        # the band table is laid out for the threshold the index was created with; a
+        # different threshold on reopening only changes which candidates are accepted
+        self.bands = json.loads(stored['bands'])
+        self.rows = self.num_perm // self.bands
+
+    @staticmethod
+    def band_layout(threshold, num_perm):
+        """
+        Pick (bands, rows) with bands * rows == num_perm so that the LSH candidate
+        curve 1 - (1 - s ** rows) ** bands turns, at (1 / bands) ** (1 / rows), as
+        close below the threshold as possible. Erring low keeps true duplicates from
+        being missed; candidates are checked against the threshold on their full
+        signatures, so extra candidates cost time but not accuracy.
+        """
+        layouts = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+        below = [layout for layout in layouts if (1 / layout[0]) ** (1 / layout[1]) <= threshold]
+        return max(below or layouts[:1], key=lambda layout: (1 / layout[0]) ** (1 / layout[1]))
+
+    def shingles(self, text):
+        """Return the set of 32-bit hashes of text's lower-cased word shingles."""
+        words = re.findall(r'\w+', text.lower())
+        size = min(self.shingle_size, len(words))
+        return {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+                for i in range(len(words) - size + 1)} if words else set()
+
+    def signature(self, text):
+        """Return the MinHash signature of text, or None if it has no words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        # num_perm x shingles matrix of permuted hashes, reduced to the minimum per permutation
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % self.PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(first == second))
+
+    def find(self, signature):
+        """
+        Return (id, path, fingerprint, details, similarity) of the most similar
+        indexed resume at or above the threshold, or None.
+        """
+        if signature is None:
+            return None
+        with self.lock:
+            self.lookups += 1
+            candidates = set()
+            for band, key in enumerate(self.band_keys(signature)):
+                candidates.update(row[0] for row in self.db.execute(
+                    'SELECT id FROM bands WHERE band = ? AND hash = ?', (band, key)))
+            best = None
+            for entry_id in candidates:
+                path, stored, fingerprint, details = self.db.execute(
+                    'SELECT path, signature, fingerprint, details FROM signatures WHERE id = ?',
+                    (entry_id,)).fetchone()
+                similarity = self.similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+                if similarity >= self.threshold and (best is None or similarity > best[4]):
+                    best = (entry_id, path, fingerprint, details, similarity)
+            if best is not None:
+                self.duplicates += 1
+            return best
+
+    def add(self, path, signature, fingerprint=None, details=None):
+        """
+        Index a resume's signature and return its id.
+
+        Args:
+            path: Path of the resume, kept to report duplicates
+            signature: From signature()
+            fingerprint: ResumeParser.fingerprint() of the run that produced details
+            details: Optional parse result (a JSON-serializable dict) to reuse for duplicates
+        """
+        encoded = None if details is None else json.dumps(details)
+        with self.lock:
+            cursor = self.db.execute('INSERT INTO signatures (path, signature, fingerprint, details) VALUES (?, ?, ?, ?)',
+                                     (path, signature.tobytes(), fingerprint, encoded))
+            entry_id = cursor.lastrowid
+            self.db.executemany('INSERT INTO bands (band, hash, id) VALUES (?, ?, ?)',
+                                [(band, key, entry_id) for band, key in enumerate(self.band_keys(signature))])
+            self.db.commit()
+        return entry_id
+
+    def set_details(self, entry_id, fingerprint, details):
+        """Attach the parse result of an indexed resume once it is known."""
+        with self.lock:
+            self.db.execute('UPDATE signatures SET fingerprint = ?, details = ? WHERE id = ?',
+                            (fingerprint, json.dumps(details), entry_id))
+            self.db.commit()
+
+    def check(self, path, text, fingerprint=None):
+        """
+        Look text up and index it if it is new.
+
+        Returns:
+            (details, entry_id): details is the earlier parse result of a duplicate
+            made with the same fingerprint, else None; entry_id is the id to pass to
+            set_details() once the resume is parsed, or None if there is nothing to
+            store (an empty text or a reused result). Duplicates are recorded in
+            matches either way.
+        """
+        signature = self.signature(text)
+        match = self.find(signature)
+        if match is not None:
+            entry_id, original, stored_fingerprint, details, similarity = match
+            self.matches[path] = (original, similarity)
+            if details is not None and stored_fingerprint == fingerprint:
+                with self.lock:
+                    self.reused += 1
+                return json.loads(details), None
+        if signature is None:
+            return None, None
+        return None, self.add(path, signature)
+
+    def stats(self):
+        """Return the lookup/duplicate/reuse counters and the number of indexed resumes."""
+        with self.lock:
+            entries = self.db.execute('SELECT COUNT(*) FROM signatures').fetchone()[0]
+            return {'lookups': self.lookups, 'duplicates': self.duplicates, 'reused': self.reused,
+                    'entries': entries, 'bands': self.bands, 'rows': self.rows}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
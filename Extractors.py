@@ -0,0 +1,228 @@
+import importlib
+import importlib.util
+import io
+import os
+
+
+class Extractor:
+    """
+    Text extraction for one input format.
+
+    The backend library named by BACKEND is imported the first time a document of
+    this format is opened, so formats that are never used cost nothing at import
+    time, and a missing backend fails fast with the command that installs it.
+    Subclasses implement open(), pages() and page_text(); pages are produced lazily
+    so callers can stop at a page or character limit without reading the rest.
+    """
+
+    # format name used in error messages
+    NAME = None
+    EXTENSIONS = ()
+    MIME_TYPES = ()
+
+    # (module to import, pip package that provides it), or None if no backend is needed
+    BACKEND = None
+
+    def __init__(self):
+        self._backend = None
+
+    def available(self):
+        """Return whether the backend can be imported, without importing it."""
+        return self.BACKEND is None or importlib.util.find_spec(self.BACKEND[0]) is not None
+
+    def backend(self):
+        """Return the backend module, importing it on first use."""
+        if self._backend is None and self.BACKEND is not None:
+            module, package = self.BACKEND
+            try:
+                self._backend = importlib.import_module(module)
+            except ImportError as e:
+                raise ImportError(f"{self.NAME} input needs the {package} package, "
+                                  f"install it with: python -m pip install {package}") from e
+        return self._backend
+
+    def __getstate__(self):
+        # sent to worker processes without the imported module, which they import again
+        state = self.__dict__.copy()
+        state['_backend'] = None
+        return state
+
+    @staticmethod
+    def source_bytes(source):
+        """Return the content of a bytes-like or file-like source; paths are left to the caller."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if hasattr(source, 'read'):
+            return source.read()
+        raise ValueError(f"Unsupported input type: {type(source).__name__}")
+
+    def open(self, source):
+        """Open source (a path, bytes-like or file-like object) and return a document handle."""
+        raise NotImplementedError
+
+    def pages(self, document):
+        """Return an iterable of the document's pages; page_text() reads each one."""
+        raise NotImplementedError
+
+    def page_text(self, page):
+        raise NotImplementedError
+
+    def close(self, document):
+        pass
+
+
+class PdfExtractor(Extractor):
+    NAME = 'PDF'
+    EXTENSIONS = ('.pdf',)
+    MIME_TYPES = ('application/pdf',)
+    BACKEND = ('pymupdf', 'PyMuPDF')
+
+    def open(self, source):
+        pdf_lib = self.backend()
+        try:
+            if isinstance(source, (str, os.PathLike)):
+                return pdf_lib.open(source)
+            return pdf_lib.open(stream=self.source_bytes(source), filetype='pdf')
+        except Exception as e:
+            raise ValueError(f"Error reading PDF: {str(e)}")
+
+    def pages(self, document):
+        return document
+
+    def page_text(self, page):
+        try:
+            return page.get_text()
+        except Exception as e:
+            raise ValueError(f"Error reading PDF: {str(e)}")
+
+    def close(self, document):
+        document.close()
+
+
+class DocxExtractor(Extractor):
+    NAME = 'DOCX'
+    EXTENSIONS = ('.docx',)
+    MIME_TYPES = ('application/vnd.openxmlformats-officedocument.wordprocessingml.document',)
+    BACKEND = ('docx2txt', 'docx2txt')
+
+    def open(self, source):
+        docx2txt = self.backend()
+        if not isinstance(source, (str, os.PathLike)):
+            source = io.BytesIO(self.source_bytes(source))
+        try:
+            return docx2txt.process(source)
+        except Exception as e:
+            raise ValueError(f"Error reading DOCX: {str(e)}")
+
+    def pages(self, document):
+        # DOCX files carry no page breaks; the whole text is one page
+        return [document]
+
+    def page_text(self, page):
+        return page
+
+
+class TextExtractor(Extractor):
+    NAME = 'TXT'
+    EXTENSIONS = ('.txt',)
+    MIME_TYPES = ('text/plain',)
+
+    # encoding plain-text resumes are decoded with; undecodable bytes are replaced
+    ENCODING = 'utf-8'
+
+    def open(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                data = f.read()
+        else:
+            data = self.source_bytes(source)
+        return data.decode(self.ENCODING, errors='replace')
+
+    def pages(self, document):
+        # form feeds are the only page breaks plain text has
+        return document.split('\f')
+
+    def page_text(self, page):
+        return page
+
+
+class ExtractorRegistry:
+    """
+    Maps file extensions and MIME types to Extractors.
+
+    Paths are looked up by extension. Bytes and file-like inputs carry no name, so
+    their format is taken from the mime_type argument or sniffed from the leading
+    bytes (PDF and ZIP/DOCX signatures), and is PDF otherwise.
+
+    Args:
+        extractors: Extractors to register, see register()
+    """
+
+    # leading bytes of in-memory inputs -> extension
+    SIGNATURES = ((b'%PDF', '.pdf'), (b'PK\x03\x04', '.docx'))
+    DEFAULT_EXTENSION = '.pdf'
+
+    def __init__(self, extractors=()):
+        self.by_extension = {}
+        self.by_mime_type = {}
+        for extractor in extractors:
+            self.register(extractor)
+
+    @classmethod
+    def default(cls):
+        """Return a registry with the PDF, DOCX and TXT extractors."""
+        return cls([PdfExtractor(), DocxExtractor(), TextExtractor()])
+
+    def register(self, extractor):
+        """Add extractor for its EXTENSIONS and MIME_TYPES, replacing earlier ones."""
+        for extension in extractor.EXTENSIONS:
+            self.by_extension[extension.lower()] = extractor
+        for mime_type in extractor.MIME_TYPES:
+            self.by_mime_type[mime_type] = extractor
+
+    def extensions(self):
+        return tuple(self.by_extension)
+
+    def available(self):
+        """Return the extensions whose backend is installed."""
+        return tuple(extension for extension, extractor in self.by_extension.items() if extractor.available())
+
+    def for_source(self, source, mime_type=None):
+        """
+        Return the Extractor for source.
+
+        Raises:
+            ValueError: If the extension or MIME type is not registered
+        """
+        if mime_type is not None:
+            extractor = self.by_mime_type.get(mime_type.split(';')[0].strip().lower())
+            if extractor is None:
+                raise ValueError(f"Unsupported MIME type: {mime_type}. Supported types: "
+                                 f"{', '.join(sorted(self.by_mime_type))}")
+            return extractor
+
+        if isinstance(source, (str, os.PathLike)):
+            extension = os.path.splitext(source)[1].lower()
+        else:
+            extension = self.sniff(source)
+        extractor = self.by_extension.get(extension)
+        if extractor is None:
+            raise ValueError(f"Unsupported file format: {extension}. Supported formats: "
+                             f"{', '.join(self.extensions())}")
+        return extractor
+
+    def sniff(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            head = bytes(source[:8])
+        elif hasattr(source, 'peek'):
+            head = source.peek(8)[:8]
+        elif hasattr(source, 'seek') and hasattr(source, 'tell'):
+            position = source.tell()
+            head = source.read(8)
+            source.seek(position)
+        else:
+            return self.DEFAULT_EXTENSION
+        for signature, extension in self.SIGNATURES:
+            if head.startswith(signature):
+                return extension
+        return self.DEFAULT_EXTENSION
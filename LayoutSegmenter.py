@@ -0,0 +1,161 @@
+import collections
+import re
+
+
+class LayoutSegmenter:
+    """
+    Section detection from PDF layout instead of from the flattened text.
+
+    Lines are read from ``page.get_text("dict")`` with their font size, weight and
+    position. Two-column pages are read column by column. A line is a heading
+    candidate only if the whole line is a known heading alias, so body text that
+    merely mentions "Experience" is never split on. When some candidates stand out
+    by font (larger than the body text, bold or all caps), only those styled
+    candidates are kept.
+
+    Args:
+        aliases: Dict of normalized heading alias (see normalize()) to section title
+    """
+
+    # a line counts as larger than the body text at this ratio of the body font size
+    HEADING_SIZE_RATIO = 1.1
+
+    # pymupdf span flag for bold text
+    BOLD_FLAG = 16
+
+    # a vertical gap of this many line heights starts a new entry ('\n\n\n' in the text)
+    ENTRY_GAP = 2.0
+
+    # share of a page's characters each side needs for the page to be read as two columns
+    COLUMN_SHARE = 0.2
+
+    def __init__(self, aliases):
+        self.aliases = aliases
+        self.pages_read = 0
+
+    @staticmethod
+    def normalize(text):
+        return re.sub(r'\s+', ' ', text).strip().rstrip(':').strip().lower()
+
+    def segment(self, pdf_document, max_pages=None, max_chars=None):
+        """
+        Read a PDF in layout order and find its section headings. Pages are read
+        only until max_chars characters of text are collected; pages_read is set
+        to the number of pages read.
+
+        Args:
+            pdf_document: Open pymupdf Document
+            max_pages: Maximum number of pages to read
+            max_chars: Maximum number of characters of text to return
+
+        Returns:
+            (text, headings) where headings is a list of (section title, start, end)
+            character offsets of each heading line in text, in reading order
+        """
+        lines, chars = [], 0
+        self.pages_read = 0
+        for index, page in enumerate(pdf_document):
+            if max_pages is not None and index >= max_pages:
+                break
+            if max_chars is not None and chars >= max_chars:
+                # the text is cut before anything a later page would add
+                break
+            page_lines = self.page_lines(page)
+            lines.extend(page_lines)
+            # a lower bound of the text length, entry gaps add more
+            chars += sum(len(line['text']) + 1 for line in page_lines)
+            self.pages_read = index + 1
+
+        body_size = self.body_font_size(lines)
+        candidates = []
+        for line in lines:
+            section = self.aliases.get(self.normalize(line['text']))
+            if section is not None:
+                candidates.append((line, section, self.is_styled(line, body_size)))
+        if any(styled for line, section, styled in candidates):
+            candidates = [candidate for candidate in candidates if candidate[2]]
+        heading_lines = {id(line): section for line, section, styled in candidates}
+
+        parts, headings, offset, previous = [], [], 0, None
+        for line in lines:
+            if previous is not None and self.starts_entry(previous, line):
+                parts.append('\n\n')
+                offset += 2
+            text = line['text'] + '\n'
+            if id(line) in heading_lines:
+                headings.append((heading_lines[id(line)], offset, offset + len(line['text'])))
+            parts.append(text)
+            offset += len(text)
+            previous = line
+            if max_chars is not None and offset >= max_chars:
+                break
+
+        text = ''.join(parts)
+        if max_chars is not None:
+            text = text[:max_chars]
+            headings = [heading for heading in headings if heading[2] <= max_chars]
+        return text, headings
+
+    def page_lines(self, page):
+        """Return the non-empty text lines of a page in reading order."""
+        lines = []
+        for block in page.get_text('dict')['blocks']:
+            if block.get('type') != 0:
+                continue
+            for line in block['lines']:
+                spans = [span for span in line['spans'] if span['text']]
+                text = ''.join(span['text'] for span in spans)
+                if not text.strip():
+                    continue
+                lines.append({
+                    'text': text.strip(),
+                    'bbox': line['bbox'],
+                    'page': page.number,
+                    'size': max(span['size'] for span in spans),
+                    'bold': all(span['flags'] & self.BOLD_FLAG or 'bold' in span['font'].lower()
+                                for span in spans if span['text'].strip()),
+                    'chars': sum(len(span['text']) for span in spans),
+                })
+        return self.reading_order(lines, page.rect.width)
+
+    def reading_order(self, lines, width):
+        middle = width / 2
+        left = [line for line in lines if line['bbox'][2] <= middle]
+        right = [line for line in lines if line['bbox'][0] >= middle]
+        total = sum(line['chars'] for line in lines) or 1
+        if (sum(line['chars'] for line in left) < self.COLUMN_SHARE * total or
+                sum(line['chars'] for line in right) < self.COLUMN_SHARE * total):
+            # single column: keep the document's own order
+            return lines
+
+        # two columns: lines that span the gutter (e.g. a full-width header) close the
+        # current band; within a band the left column is read before the right one
+        ordered, band_left, band_right = [], [], []
+        for line in sorted(lines, key=lambda line: (line['bbox'][1], line['bbox'][0])):
+            if line['bbox'][2] <= middle:
+                band_left.append(line)
+            elif line['bbox'][0] >= middle:
+                band_right.append(line)
+            else:
+                ordered.extend(band_left + band_right + [line])
+                band_left, band_right = [], []
+        return ordered + band_left + band_right
+
+    @staticmethod
+    def body_font_size(lines):
+        sizes = collections.Counter()
+        for line in lines:
+            sizes[round(line['size'], 1)] += line['chars']
+        return sizes.most_common(1)[0][0] if sizes else 0.0
+
+    def is_styled(self, line, body_size):
+        text = line['text']
+        return (line['size'] >= body_size * self.HEADING_SIZE_RATIO or line['bold'] or
+                (text.isupper() and len(text) > 3))
+
+    def starts_entry(self, previous, line):
+        if previous['page'] != line['page']:
+            return False
+        height = previous['bbox'][3] - previous['bbox'][1]
+        gap = line['bbox'][1] - previous['bbox'][3]
+        return height > 0 and gap > self.ENTRY_GAP * height
@@ -0,0 +1,107 @@
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+class ParseCache:
+    """
+    Content-addressed cache of ResumeParser results.
+
+    Entries are keyed by a hash of the input file's bytes together with
+    ResumeParser.fingerprint() (model, heading CSV and parser versions), so a
+    re-submitted resume is served without extraction or NLP. A bounded in-memory
+    LRU sits in front of an optional sqlite store that survives restarts.
+
+    Args:
+        path: sqlite file for the on-disk tier; None keeps results in memory only
+        max_entries: Number of results kept in the in-memory LRU
+    """
+
+    def __init__(self, path=None, max_entries=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db = None
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, details TEXT NOT NULL)')
+            self.db.commit()
+
+    @staticmethod
+    def key(data, fingerprint):
+        """
+        Build the cache key for one input.
+
+        Args:
+            data: Raw bytes of the resume file
+            fingerprint: String from ResumeParser.fingerprint()
+
+        Returns:
+            Hex digest identifying the input and parser configuration
+        """
+        digest = hashlib.sha256(fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached parse_information() dict for key, or None on a miss."""
+        with self.lock:
+            encoded = self.memory.get(key)
+            if encoded is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return json.loads(encoded)
+
+            if self.db is not None:
+                row = self.db.execute('SELECT details FROM results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, key, details):
+        """Store a parse_information() dict under key in both tiers."""
+        encoded = json.dumps(details)
+        with self.lock:
+            self._remember(key, encoded)
+            if self.db is not None:
+                self.db.execute('INSERT OR REPLACE INTO results (key, details) VALUES (?, ?)', (key, encoded))
+                self.db.commit()
+
+    def _remember(self, key, encoded):
+        # results are held JSON-encoded so callers can never mutate a cached entry
+        self.memory[key] = encoded
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Return the hit/miss/eviction counters and the number of entries held in memory."""
+        with self.lock:
+            return {'hits': self.hits, 'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'memory_entries': len(self.memory)}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
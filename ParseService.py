@@ -0,0 +1,395 @@
+"""
+Local resume parsing service.
+
+Loads the spaCy model and compiles the matchers once in the parent process,
+then forks the worker processes, which share that memory copy-on-write instead
+of each loading a model of their own. An asyncio front end accepts HTTP/1.1
+requests on a TCP port or a Unix socket and hands each resume to a free worker.
+
+Endpoints:
+    POST /parse      resume bytes (PDF or DOCX) as the request body; returns the
+                     parse_record() dict. ?fast=1 and ?layout=1 override the defaults.
+    GET  /health     worker and queue state; 503 while no worker is alive
+    GET  /metrics    request counters and latency percentiles
+
+Usage:
+    python ParseService.py --port 8080 --workers 4 --max-queue 32
+    python ParseService.py --unix /tmp/resume.sock --workers 2
+    curl --data-binary @resume.pdf http://127.0.0.1:8080/parse
+"""
+
+import argparse
+import asyncio
+import collections
+import gc
+import json
+import multiprocessing
+import os
+import signal
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from ResumeParser import ResumeParser
+
+
+def _init_worker(settings):
+    # only used where fork is not available: spawned workers load their own model
+    for name, value in settings.items():
+        setattr(ResumeParser, name, value)
+    ResumeParser.warmup()
+
+
+def _init_forked_worker():
+    # a pool forked while the service runs inherits its sockets and the event loop's signal
+    # handling. A connection the service closes would stay open in the worker, so its client
+    # never sees the response end, and a worker's SIGTERM would reach the service's loop
+    # instead of ending the worker. Sockets are pointed at /dev/null rather than closed, so
+    # their fd numbers are not reused while the socket objects still refer to them
+    null = os.open(os.devnull, os.O_RDWR)
+    fd_dir = '/proc/self/fd' if os.path.isdir('/proc/self/fd') else '/dev/fd'
+    for name in os.listdir(fd_dir):
+        try:
+            if stat.S_ISSOCK(os.fstat(int(name)).st_mode):
+                os.dup2(null, int(name))
+        except OSError:
+            pass
+    os.close(null)
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+class _TrackingContext:
+    # mp_context for the worker pool that keeps the processes it starts, so their
+    # liveness is known without reaching into ProcessPoolExecutor
+    def __init__(self, context):
+        self.context = context
+        self.processes = []
+
+    def Process(self, *args, **kwargs):
+        process = self.context.Process(*args, **kwargs)
+        self.processes.append(process)
+        return process
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
+
+
+class ParseService:
+    """
+    Prefork HTTP front end for ResumeParser.parse_record().
+
+    Admission control keeps the service responsive under load: a request body
+    over max_body is refused with 413 before it is read, and once workers +
+    max_queue resumes are admitted, further parse requests get 503 with a
+    Retry-After header at once instead of waiting in an unbounded queue.
+
+    Args:
+        workers: Number of worker processes
+        max_queue: Resumes that may wait for a worker beyond the ones being parsed
+        max_body: Largest request body accepted, in bytes
+        fast: Default for ?fast, see ResumeParser.__init__
+        disable: Pipeline components to skip, defaults to DISABLED_PIPES
+        layout: Default for ?layout, see ResumeParser.get_layout_text()
+    """
+
+    # requests whose latencies /metrics reports percentiles over
+    LATENCY_WINDOW = 1000
+
+    # seconds a client is asked to wait after a 503
+    RETRY_AFTER = 1
+
+    # seconds between checks for a dead worker while serving
+    MONITOR_INTERVAL = 1.0
+
+    # HTTP status per parse_record() status
+    RECORD_STATUS = {'ok': HTTPStatus.OK, 'truncated': HTTPStatus.OK,
+                     'failed': HTTPStatus.UNPROCESSABLE_ENTITY, 'timeout': HTTPStatus.GATEWAY_TIMEOUT}
+
+    def __init__(self, workers=2, max_queue=16, max_body=10 * 1024 * 1024, fast=False, disable=None, layout=False):
+        self.workers = max(workers, 1)
+        self.max_queue = max_queue
+        self.max_body = max_body
+        self.options = {'fast': fast, 'disable': disable, 'layout': layout}
+        self.pool = None
+        # worker processes the current pool has started, and the task replacing a broken pool
+        self.processes = []
+        self.replacing = None
+        self.in_flight = 0
+        self.started = None
+        self.counts = collections.Counter()
+        # (total seconds in the service, seconds spent parsing) of recent parse requests
+        self.latencies = collections.deque(maxlen=self.LATENCY_WINDOW)
+
+    def start(self):
+        """Load the model and matchers, then fork the workers; call before serving."""
+        ResumeParser.warmup()
+        self.pool, self.processes = self._create_pool()
+        self.started = time.time()
+
+    def _create_pool(self):
+        # returns (pool, list its worker processes are added to); blocks until the pool is up
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # objects that exist now are left out of garbage collection, so the cyclic
+            # collector does not write to (and thereby copy) the pages they live on
+            gc.freeze()
+            context = _TrackingContext(multiprocessing.get_context('fork'))
+            pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_forked_worker)
+        else:
+            settings = {name: getattr(ResumeParser, name) for name in ResumeParser.GUARDED_SETTINGS}
+            context = _TrackingContext(multiprocessing.get_context('spawn'))
+            pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                       initializer=_init_worker, initargs=(settings,))
+        # with fork every worker is started on the first submit, before any request is served
+        pool.submit(os.getpid).result()
+        return pool, context.processes
+
+    async def serve(self, host='127.0.0.1', port=8080, unix_path=None):
+        """
+        Accept requests until SIGINT or SIGTERM.
+
+        Args:
+            host, port: TCP address to listen on, unless unix_path is given
+            unix_path: Unix socket path to listen on instead; a stale socket file is replaced
+        """
+        if self.pool is None:
+            self.start()
+        if unix_path is not None:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            address = unix_path
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            address = '{}:{}'.format(*server.sockets[0].getsockname()[:2])
+        print(f"serving on {address} with {self.workers} workers", file=sys.stderr)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # not on Windows event loops, nor outside the main thread
+                pass
+        monitor = loop.create_task(self.monitor())
+        async with server:
+            await stop.wait()
+        monitor.cancel()
+        self.close()
+
+    async def monitor(self):
+        # a dead worker breaks its whole ProcessPoolExecutor; replace the pool right away
+        # instead of at the next parse request, so /health recovers on its own
+        while True:
+            await asyncio.sleep(self.MONITOR_INTERVAL)
+            if self.pool is not None and self.broken():
+                try:
+                    await asyncio.shield(self.replace_pool(self.pool))
+                except Exception as e:
+                    print(f"replacing the worker pool failed: {e}", file=sys.stderr)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    async def handle(self, reader, writer):
+        # one client connection; requests are answered in turn while it keeps the connection open
+        try:
+            while True:
+                request = await self.read_head(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                length = headers.get('content-length')
+                if 'chunked' in headers.get('transfer-encoding', '').lower():
+                    status, payload, keep_alive = HTTPStatus.LENGTH_REQUIRED, {'error': 'send a Content-Length'}, False
+                elif length is not None and (not length.isdigit() or int(length) > self.max_body):
+                    # refused before the body is read, so the connection cannot be reused
+                    self.counts['too_large'] += 1
+                    status, payload, keep_alive = (HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                                   {'error': f"body exceeds {self.max_body} bytes"}, False)
+                else:
+                    body = await reader.readexactly(int(length)) if length else b''
+                    status, payload = await self.dispatch(method, target, body)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def read_head(reader):
+        """Return (method, target, lower-cased headers) of the next request, or None at end of stream."""
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, headers
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = [f"HTTP/1.1 {status.value} {status.phrase}", 'Content-Type: application/json',
+                f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head.append(f"Retry-After: {self.RETRY_AFTER}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        """Return (HTTPStatus, JSON payload) for a request."""
+        url = urlsplit(target)
+        if url.path == '/parse':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'POST the resume to /parse'}
+            return await self.parse(body, parse_qs(url.query))
+        if method != 'GET':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{url.path} only answers GET"}
+        if url.path == '/health':
+            health = self.health()
+            return HTTPStatus.OK if health['status'] == 'ok' else HTTPStatus.SERVICE_UNAVAILABLE, health
+        if url.path == '/metrics':
+            return HTTPStatus.OK, self.metrics()
+        return HTTPStatus.NOT_FOUND, {'error': f"no endpoint {url.path}"}
+
+    async def parse(self, body, query):
+        self.counts['requests'] += 1
+        if not body:
+            self.counts['failed'] += 1
+            return HTTPStatus.BAD_REQUEST, {'error': 'empty request body'}
+        if self.in_flight >= self.workers + self.max_queue:
+            self.counts['rejected'] += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'parse queue is full', 'queued': self.queued()}
+
+        options = dict(self.options)
+        for name in ('fast', 'layout'):
+            if name in query:
+                options[name] = query[name][-1].lower() in ('1', 'true', 'yes')
+        if self.broken():
+            # the pool broke while idle, e.g. a worker was killed by the OOM killer, and the
+            # monitor has not replaced it yet
+            await asyncio.shield(self.replace_pool(self.pool))
+        start = time.perf_counter()
+        pool = self.pool
+        self.in_flight += 1
+        try:
+            record = await asyncio.get_running_loop().run_in_executor(
+                pool, ResumeParser.parse_record, body, options['fast'], options['disable'], options['layout'])
+        except BrokenProcessPool:
+            # a worker died (e.g. a crash inside a PDF library); every parse the pool held
+            # fails, and the first of them starts a new pool for the requests that follow
+            self.counts['failed'] += 1
+            self.replace_pool(pool)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'status': 'failed', 'error': 'resume worker exited'}
+        finally:
+            self.in_flight -= 1
+        self.latencies.append((time.perf_counter() - start, record['seconds']))
+        self.counts[record['status']] += 1
+        del record['path']
+        return self.RECORD_STATUS[record['status']], record
+
+    def replace_pool(self, pool):
+        """
+        Start replacing a broken pool with a new one, once however many callers notice
+        it. The new pool is started in a thread, so the event loop keeps serving.
+
+        Returns:
+            The asyncio task doing the replacement, or None if pool is no longer current
+        """
+        if self.pool is pool and self.replacing is None:
+            self.replacing = asyncio.get_running_loop().create_task(self._replace(pool))
+        return self.replacing
+
+    async def _replace(self, pool):
+        try:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.pool, self.processes = await asyncio.get_running_loop().run_in_executor(None, self._create_pool)
+            self.counts['restarts'] += 1
+        finally:
+            self.replacing = None
+
+    def broken(self):
+        """Whether a worker of the current pool has exited, which breaks the pool."""
+        return any(process.exitcode is not None for process in list(self.processes))
+
+    def alive(self):
+        """Number of live worker processes of the current pool."""
+        if self.pool is None:
+            return 0
+        return sum(process.is_alive() for process in list(self.processes))
+
+    def queued(self):
+        """Number of admitted resumes waiting for a worker."""
+        return max(self.in_flight - self.workers, 0)
+
+    def health(self):
+        alive = self.alive()
+        return {'status': 'ok' if self.pool is not None and alive and not self.broken() else 'unavailable',
+                'workers': self.workers, 'alive': alive, 'in_flight': self.in_flight,
+                'queued': self.queued(), 'max_queue': self.max_queue, 'model': ResumeParser.MODEL_NAME,
+                'uptime': time.time() - self.started if self.started else 0.0}
+
+    def metrics(self):
+        """Return the request counters and latency percentiles (seconds) of the last LATENCY_WINDOW parses."""
+        result = {'counts': dict(self.counts), 'in_flight': self.in_flight, 'queued': self.queued()}
+        if self.latencies:
+            latencies = np.array(self.latencies)
+            for column, name in enumerate(('latency', 'parse')):
+                values = latencies[:, column]
+                p50, p90, p99 = np.percentile(values, [50, 90, 99])
+                result[name] = {'count': len(values), 'mean': float(values.mean()), 'p50': float(p50),
+                                'p90': float(p90), 'p99': float(p99), 'max': float(values.max())}
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve resume parsing over HTTP from prefork workers.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=2, help='worker processes forked after the model is loaded')
+    parser.add_argument('--max-queue', type=int, default=16,
+                        help='resumes that may wait for a worker; more are refused with 503')
+    parser.add_argument('--max-body', type=int, default=10 * 1024 * 1024, help='largest accepted upload in bytes')
+    parser.add_argument('--model', help='spaCy model name or path')
+    parser.add_argument('--fast', action='store_true', help='tokenizer-only segmentation, see ResumeParser')
+    parser.add_argument('--max-pages', type=int, help='read at most this many pages per resume')
+    parser.add_argument('--max-tokens', type=int, help='send at most this many tokens per resume through spaCy')
+    parser.add_argument('--max-seconds', type=float, help='time budget per resume; overruns answer 504')
+    args = parser.parse_args(argv)
+
+    if args.model:
+        ResumeParser.configure(model_name=args.model)
+    ResumeParser.MAX_PAGES = args.max_pages
+    ResumeParser.MAX_TOKENS = args.max_tokens
+    ResumeParser.MAX_SECONDS = args.max_seconds
+    service = ParseService(workers=args.workers, max_queue=args.max_queue, max_body=args.max_body, fast=args.fast)
+    service.start()
+    asyncio.run(service.serve(args.host, args.port, args.unix))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+
+from ResumeParser import ResumeParser
+
+# string columns are Arrow-backed when pyarrow is installed, so the cleanup below runs
+# in Arrow's compute kernels instead of a Python loop over the rows
+STRING_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') is not None else 'string'
+
+
+class ResultTable:
+    """
+    Parse results of a batch in columnar form.
+
+    resumes has one row per input, with the columns path, error, one column per
+    CANDIDATE_INFO field (missing fields are null rather than 'Null') and one per
+    SECTION_TITLE[1:] section (only DETAILS_SECTIONS when built from
+    parse_information() results). SummaryText and the other text sections hold
+    whitespace-normalized text, WorkExperience the list of entries and
+    ToolsAndTechnologies the normalized skills. experience has one row per work
+    experience entry: resume (row of resumes), path, entry (position within the
+    resume) and text.
+
+    Section text is cleaned and split for the whole batch at once with pandas
+    string methods instead of per resume, and both tables go to Parquet as they are.
+
+    Args:
+        resumes: DataFrame, one row per resume
+        experience: DataFrame, one row per work experience entry
+    """
+
+    # SECTION_TITLE entry whose text is split into entries rather than normalized
+    ENTRIES_SECTION = ResumeParser.SECTION_TITLE[3]
+
+    # SECTION_TITLE entry whose column holds the normalized skills rather than text
+    SKILLS_SECTION = ResumeParser.SECTION_TITLE[2]
+
+    # the sections parse_information() returns; the others would always be null there
+    DETAILS_SECTIONS = ResumeParser.SECTION_TITLE[1:4]
+
+    def __init__(self, resumes, experience):
+        self.resumes = resumes
+        self.experience = experience
+
+    @classmethod
+    def parse(cls, paths, batch_size=32, n_process=1, fast=False, disable=None, layout=False):
+        """Parse paths with ResumeParser.parse_many() in compact mode and return a ResultTable."""
+        return cls.from_parsed(ResumeParser.parse_many(paths, batch_size=batch_size, n_process=n_process, fast=fast,
+                                                       disable=disable, compact=True, layout=layout))
+
+    @classmethod
+    def from_parsed(cls, results):
+        """
+        Build the tables from compact results.
+
+        Args:
+            results: Iterable of (path, ParsedResume or None, error), e.g. from
+                parse_many(..., compact=True)
+        """
+        titles = [title for title in ResumeParser.SECTION_TITLE[1:] if title != cls.SKILLS_SECTION]
+        paths, errors, candidates, skills = [], [], [], []
+        sections = {title: [] for title in titles}
+        for path, parsed, error in results:
+            paths.append(os.fspath(path) if isinstance(path, (str, os.PathLike)) else None)
+            errors.append(None if error is None else str(error))
+            candidates.append({} if parsed is None else parsed.candidate_info)
+            skills.append(None if parsed is None or parsed.skills is None else list(parsed.skills))
+            for title in titles:
+                sections[title].append(None if parsed is None else parsed.section(title))
+
+        raw = {title: pd.Series(texts, dtype=STRING_DTYPE) for title, texts in sections.items()}
+        entries = raw.pop(cls.ENTRIES_SECTION).str.split('\n\n\n')
+        columns = {title: cls.clean(texts) for title, texts in raw.items()}
+        return cls.build(paths, errors, cls.candidate_frame(candidates), columns, entries, skills)
+
+    @classmethod
+    def from_details(cls, results):
+        """
+        Build the tables from parse_information() dicts, e.g. cached or guarded
+        results, with a column for each of DETAILS_SECTIONS.
+
+        Args:
+            results: Iterable of (path, details dict or None, error)
+        """
+        titles = [title for title in cls.DETAILS_SECTIONS if title not in (cls.SKILLS_SECTION, cls.ENTRIES_SECTION)]
+        paths, errors, candidates, entries, skills = [], [], [], [], []
+        sections = {title: [] for title in titles}
+        for path, details, error in results:
+            details = details or {}
+            paths.append(os.fspath(path) if isinstance(path, (str, os.PathLike)) else None)
+            errors.append(None if error is None else str(error))
+            candidates.append(details.get(ResumeParser.SECTION_TITLE[0], {}))
+            entries.append(details.get(cls.ENTRIES_SECTION))
+            skills.append(details.get(cls.SKILLS_SECTION))
+            for title in titles:
+                sections[title].append(details.get(title))
+
+        columns = {title: pd.Series(texts, dtype=STRING_DTYPE) for title, texts in sections.items()}
+        return cls.build(paths, errors, cls.candidate_frame(candidates), columns, pd.Series(entries, dtype=object),
+                         skills)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """
+        Build the tables from an Arrow table with the columns path, error and result,
+        result holding parse_information() dicts as a struct (e.g. JSONL read with
+        pyarrow.json), without turning any row into a dict. Like from_details(), with
+        a column for each of DETAILS_SECTIONS; struct fields that are missing are null.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        def field(values, name):
+            if values is not None and pa.types.is_struct(values.type) and values.type.get_field_index(name) >= 0:
+                return pc.struct_field(values, name)
+            return None
+
+        def series(values, dtype):
+            if values is None:
+                return pd.Series([None] * len(table), dtype=dtype)
+            return values.to_pandas().astype(dtype)
+
+        result = table.column('result') if 'result' in table.column_names else None
+        info = field(result, ResumeParser.SECTION_TITLE[0])
+        fields = list(dict.fromkeys(item['id'] for item in ResumeParser.CANDIDATE_INFO))
+        candidate = pd.DataFrame({name: series(field(info, name), STRING_DTYPE) for name in fields})
+        titles = [title for title in cls.DETAILS_SECTIONS if title not in (cls.SKILLS_SECTION, cls.ENTRIES_SECTION)]
+        columns = {title: series(field(result, title), STRING_DTYPE) for title in titles}
+        return cls.build(series(table.column('path'), STRING_DTYPE), series(table.column('error'), STRING_DTYPE),
+                         candidate, columns, series(field(result, cls.ENTRIES_SECTION), object),
+                         series(field(result, cls.SKILLS_SECTION), object))
+
+    @staticmethod
+    def clean(texts):
+        """Vectorized ResumeParser.clean_text() over a string Series."""
+        return texts.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    @staticmethod
+    def candidate_frame(candidates):
+        """DataFrame of the CANDIDATE_INFO fields from a list of candidate info dicts."""
+        fields = list(dict.fromkeys(info['id'] for info in ResumeParser.CANDIDATE_INFO))
+        return pd.DataFrame.from_records(candidates, columns=fields)
+
+    @classmethod
+    def build(cls, paths, errors, candidate, columns, entries, skills):
+        # entries: Series of entry lists (or missing values) per resume, empty entries included;
+        # columns: the text sections, the sections missing from it get no column
+        candidate = candidate.astype(STRING_DTYPE)
+        candidate = candidate.mask(candidate == 'Null')
+
+        exploded = entries.explode()
+        exploded = exploded[exploded.notna() & (exploded != '')].astype(STRING_DTYPE)
+        rows = exploded.index.to_numpy(dtype=np.int64)
+        experience = pd.DataFrame({'resume': rows,
+                                   'path': pd.Series(paths, dtype=STRING_DTYPE).take(rows).to_numpy(),
+                                   'entry': exploded.groupby(level=0).cumcount().to_numpy(),
+                                   'text': exploded.to_numpy()})
+        experience['path'] = experience['path'].astype(STRING_DTYPE)
+        experience['text'] = experience['text'].astype(STRING_DTYPE)
+
+        # the exploded entries are in row order, so each resume's list is one slice of them;
+        # resumes with the section but no non-empty entry get [], as in parse_information()
+        counts = np.bincount(rows, minlength=len(paths))
+        chunks = np.split(exploded.to_numpy(dtype=object), np.cumsum(counts)[:-1])
+        work = [chunk.tolist() if present else None for chunk, present in zip(chunks, entries.notna().to_numpy())]
+
+        resumes = pd.DataFrame({'path': pd.Series(paths, dtype=STRING_DTYPE),
+                                'error': pd.Series(errors, dtype=STRING_DTYPE)})
+        resumes = pd.concat([resumes, candidate], axis=1)
+        for title in ResumeParser.SECTION_TITLE[1:]:
+            if title == cls.ENTRIES_SECTION:
+                resumes[title] = pd.Series(work, dtype=object)
+            elif title == cls.SKILLS_SECTION:
+                resumes[title] = pd.Series(skills, dtype=object)
+            elif title in columns:
+                resumes[title] = columns[title]
+        return cls(resumes, experience)
+
+    def to_parquet(self, path, experience_path=None):
+        """
+        Write resumes to path and, if experience_path is given, experience to it.
+        List columns are stored as Parquet lists of strings.
+        """
+        self.resumes.to_parquet(path, index=False)
+        if experience_path is not None:
+            self.experience.to_parquet(experience_path, index=False)
@@ -0,0 +1,362 @@
+import datetime
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import scipy.sparse
+
+
+class Segment:
+    """
+    One batch of indexed resumes: a sparse resume x term count matrix in CSC layout
+    (one slice per term, which is what scoring reads), resume lengths, years of
+    experience, ids and a mask of the rows still live.
+    """
+
+    def __init__(self, matrix, lengths, years, ids, live=None, name=None):
+        self.matrix = matrix
+        self.lengths = lengths
+        self.years = years
+        self.ids = ids
+        self.live = np.ones(len(ids), dtype=bool) if live is None else live
+        # directory name once saved; dirty marks a live mask changed since
+        self.name = name
+        self.dirty = False
+
+    def column(self, term_id):
+        """Return (rows, counts) of a term; terms added after this segment was built have none."""
+        if term_id >= self.matrix.shape[1]:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        start, end = self.matrix.indptr[term_id], self.matrix.indptr[term_id + 1]
+        return self.matrix.indices[start:end], self.matrix.data[start:end]
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'data.npy'), self.matrix.data)
+        np.save(os.path.join(directory, 'indices.npy'), self.matrix.indices)
+        np.save(os.path.join(directory, 'indptr.npy'), self.matrix.indptr)
+        np.save(os.path.join(directory, 'lengths.npy'), self.lengths)
+        np.save(os.path.join(directory, 'years.npy'), self.years)
+        self.save_live(directory)
+        with open(os.path.join(directory, 'ids.json'), 'w') as f:
+            json.dump(self.ids, f)
+
+    def save_live(self, directory):
+        np.save(os.path.join(directory, 'live.npy'), self.live)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, directory, name, mmap_mode='r'):
+        def array(file_name, mode=mmap_mode):
+            return np.load(os.path.join(directory, file_name), mmap_mode=mode)
+
+        with open(os.path.join(directory, 'ids.json')) as f:
+            ids = json.load(f)
+        indptr = array('indptr.npy')
+        matrix = scipy.sparse.csc_matrix((array('data.npy'), array('indices.npy'), indptr),
+                                         shape=(len(ids), len(indptr) - 1), copy=False)
+        # the live mask is small and changes on removal, so it is always read into memory
+        return cls(matrix, array('lengths.npy'), array('years.npy'), ids, np.array(array('live.npy', None)), name)
+
+
+class ResumeIndex:
+    """
+    Inverted index over parse_information() results with BM25 ranking.
+
+    Each resume becomes a row of sparse term counts over a shared vocabulary of
+    field-prefixed terms: 'skill:' for the normalized ToolsAndTechnologies skills,
+    'text:' for the words of the summary and work experience, 'loc:' for the
+    address and 'name:' for the candidate's name. Years of experience are estimated
+    from the year ranges in the work experience entries.
+
+    Resumes are added in segments. Each segment is saved as plain .npy arrays that
+    are memory-mapped when the index is opened, so adding a batch writes only the
+    new segment, and opening a large index does not read it into memory. Scoring
+    reads the query terms' columns from every segment and computes BM25 for all
+    matching resumes at once with NumPy; required terms, a location and minimum
+    years are applied as masks before the top k are selected.
+
+    Args:
+        path: Directory the index is saved to and loaded from; None keeps it in memory
+        k1: BM25 term frequency saturation
+        b: BM25 length normalization
+        current_year: Year that open-ended ranges ("2019 - present") end in, defaults to this year
+    """
+
+    VERSION = 1
+
+    WORD_REGEX = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+    YEAR_RANGE_REGEX = re.compile(r'\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)\b',
+                                  re.IGNORECASE)
+
+    def __init__(self, path=None, k1=1.2, b=0.75, current_year=None):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.current_year = current_year
+        self.vocabulary = {}
+        self.segments = []
+        # doc id -> (segment, row) of its live row
+        self.rows = {}
+        if path is not None and os.path.exists(os.path.join(path, 'meta.json')):
+            self.load()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.rows
+
+    def load(self):
+        """
+        Raises:
+            ValueError: If the index was saved by a different VERSION
+        """
+        with open(os.path.join(self.path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != self.VERSION:
+            raise ValueError(f"Resume index version {meta.get('version')} is not {self.VERSION}")
+        self.vocabulary = {term: term_id for term_id, term in enumerate(meta['vocabulary'])}
+        self.segments = [Segment.load(os.path.join(self.path, name), name) for name in meta['segments']]
+        self.rows = {}
+        for segment in self.segments:
+            for row in np.flatnonzero(segment.live):
+                self.rows[segment.ids[row]] = (segment, int(row))
+
+    def terms(self, details):
+        """Return the list of (field-prefixed) terms of one parse_information() dict."""
+        terms = ['skill:' + skill.lower() for skill in details.get('ToolsAndTechnologies') or []]
+        text = ' '.join(filter(None, [details.get('SummaryText')] + list(details.get('WorkExperience') or [])))
+        terms.extend('text:' + word for word in self.WORD_REGEX.findall(text.lower()))
+        candidate = details.get('CandidateInformation') or {}
+        for field, prefix in (('Address', 'loc:'), ('FullName', 'name:')):
+            value = candidate.get(field)
+            if value and value != 'Null':
+                terms.extend(prefix + word for word in self.WORD_REGEX.findall(value.lower()))
+        return terms
+
+    def years_of_experience(self, details):
+        """Estimate years of experience from the year ranges in the work experience entries."""
+        current_year = self.current_year or datetime.date.today().year
+        spans = []
+        for entry in details.get('WorkExperience') or []:
+            for start, end in self.YEAR_RANGE_REGEX.findall(entry):
+                end = current_year if not end[0].isdigit() else int(end)
+                if int(start) <= end:
+                    spans.append((int(start), end))
+        # overlapping jobs are counted once
+        total, covered_until = 0, None
+        for start, end in sorted(spans):
+            if covered_until is not None and start < covered_until:
+                start = covered_until
+            if end > start:
+                total += end - start
+            covered_until = end if covered_until is None else max(covered_until, end)
+        return float(total)
+
+    def add(self, results):
+        """
+        Index a batch of results as a new segment. A doc id that is already indexed
+        is replaced.
+
+        Args:
+            results: Iterable of (doc_id, details) with details a parse_information() dict
+        """
+        ids, rows, cols, counts, lengths, years = [], [], [], [], [], []
+        # a doc id repeated within the batch keeps its last result
+        for doc_id, details in dict(results).items():
+            self.remove(doc_id)
+            row = len(ids)
+            term_counts = {}
+            for term in self.terms(details):
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                term_counts[term_id] = term_counts.get(term_id, 0) + 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts)
+            counts.extend(term_counts.values())
+            lengths.append(sum(term_counts.values()))
+            years.append(self.years_of_experience(details))
+            ids.append(doc_id)
+        if not ids:
+            return
+        matrix = scipy.sparse.csc_matrix((np.array(counts, dtype=np.float32), (rows, cols)),
+                                         shape=(len(ids), len(self.vocabulary)))
+        segment = Segment(matrix, np.array(lengths, dtype=np.float32), np.array(years, dtype=np.float32), ids)
+        self.segments.append(segment)
+        for row, doc_id in enumerate(ids):
+            self.rows[doc_id] = (segment, row)
+
+    def remove(self, doc_id):
+        """Drop a resume from the index; returns whether it was indexed."""
+        entry = self.rows.pop(doc_id, None)
+        if entry is None:
+            return False
+        segment, row = entry
+        segment.live[row] = False
+        segment.dirty = True
+        return True
+
+    def save(self):
+        """Write new segments and changed live masks, then the vocabulary and segment list."""
+        if self.path is None:
+            raise ValueError("This index has no path to save to")
+        os.makedirs(self.path, exist_ok=True)
+        for segment in self.segments:
+            if segment.name is None:
+                segment.name = self._new_segment_name()
+                segment.save(os.path.join(self.path, segment.name))
+            elif segment.dirty:
+                segment.save_live(os.path.join(self.path, segment.name))
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        meta = {'version': self.VERSION, 'vocabulary': vocabulary,
+                'segments': [segment.name for segment in self.segments]}
+        temporary = os.path.join(self.path, 'meta.json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(meta, f)
+        # the segment list switches over in one step, so a crash leaves the old index readable
+        os.replace(temporary, os.path.join(self.path, 'meta.json'))
+
+    def _new_segment_name(self):
+        existing = [int(name.split('-')[1]) for name in os.listdir(self.path) if name.startswith('segment-')]
+        return f'segment-{max(existing, default=-1) + 1:06d}'
+
+    def merge(self):
+        """
+        Rewrite all segments as one without the removed rows. Many small segments
+        (one per add() call) slow queries down, so merge from time to time; when the
+        index has a path it is saved and the old segment files are deleted.
+        """
+        live = [(segment, np.flatnonzero(segment.live)) for segment in self.segments]
+        width = len(self.vocabulary)
+        matrices = []
+        for segment, rows in live:
+            matrix = segment.matrix.tocsr()[rows]
+            matrices.append(scipy.sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                                    shape=(len(rows), width)))
+        if not matrices:
+            return
+        ids = [segment.ids[row] for segment, rows in live for row in rows]
+        merged = Segment(scipy.sparse.vstack(matrices, format='csc', dtype=np.float32),
+                         np.concatenate([np.asarray(segment.lengths)[rows] for segment, rows in live]),
+                         np.concatenate([np.asarray(segment.years)[rows] for segment, rows in live]), ids)
+        old = [segment.name for segment in self.segments if segment.name is not None]
+        self.segments = [merged]
+        self.rows = {doc_id: (merged, row) for row, doc_id in enumerate(ids)}
+        if self.path is not None:
+            self.save()
+            for name in old:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def search(self, skills=(), text='', location='', min_years=None, k=10):
+        """
+        Return the top k resumes for a query, best first.
+
+        Args:
+            skills: Skills every result must have (normalized names, any case)
+            text: Free text; its words are ranked with BM25 and every result must
+                contain at least one of them
+            location: Words every result's address must contain, e.g. 'TX'
+            min_years: Minimum estimated years of experience
+            k: Number of results
+
+        Returns:
+            List of (doc_id, score)
+        """
+        required = ['skill:' + skill.lower() for skill in skills]
+        required += ['loc:' + word for word in self.WORD_REGEX.findall(location.lower())]
+        words = ['text:' + word for word in self.WORD_REGEX.findall(text.lower())]
+        if any(term not in self.vocabulary for term in required) or not self.rows:
+            return []
+        term_ids = [self.vocabulary[term] for term in dict.fromkeys(required + words) if term in self.vocabulary]
+        required_ids = {self.vocabulary[term] for term in required}
+        word_ids = {self.vocabulary[term] for term in words if term in self.vocabulary}
+        if words and not word_ids:
+            # no resume contains any of the text words
+            return []
+
+        # document frequencies and the average length over every live resume
+        total = len(self.rows)
+        document_frequency = np.zeros(len(term_ids))
+        length_sum = 0.0
+        for segment in self.segments:
+            length_sum += float(np.asarray(segment.lengths)[segment.live].sum())
+            for i, term_id in enumerate(term_ids):
+                rows, counts = segment.column(term_id)
+                document_frequency[i] += segment.live[rows].sum()
+        average_length = length_sum / total if total else 1.0
+        idf = np.log1p((total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        candidates = []
+        for segment in self.segments:
+            size = len(segment.ids)
+            scores = np.zeros(size, dtype=np.float64)
+            mask = segment.live.copy()
+            matched = np.zeros(size, dtype=bool)
+            if min_years is not None:
+                mask &= np.asarray(segment.years) >= min_years
+            norm = self.k1 * (1 - self.b + self.b * np.asarray(segment.lengths) / average_length)
+            for i, term_id in enumerate(term_ids):
+                rows, counts = segment.column(term_id)
+                counts = np.asarray(counts, dtype=np.float64)
+                scores[rows] += idf[i] * counts * (self.k1 + 1) / (counts + norm[rows])
+                if term_id in word_ids:
+                    matched[rows] = True
+                if term_id in required_ids:
+                    present = np.zeros(size, dtype=bool)
+                    present[rows] = True
+                    mask &= present
+            if word_ids:
+                mask &= matched
+            if not term_ids:
+                # a years-only query ranks by experience
+                scores = np.asarray(segment.years, dtype=np.float64).copy()
+            rows = np.flatnonzero(mask)
+            if len(rows) > k:
+                rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+            candidates.extend((scores[row], segment.ids[row]) for row in rows)
+
+        candidates.sort(key=lambda candidate: -candidate[0])
+        return [(doc_id, float(score)) for score, doc_id in candidates[:k]]
+
+    @staticmethod
+    def parse_query(query, extractor=None, tokenizer=None):
+        """
+        Turn a query like "Python + Kubernetes + 5 years, in TX" into search() arguments.
+
+        Parts are separated by ',' or by a '+' with whitespace on both sides, so
+        "C++" and "5+ years" stay whole. "N years" sets min_years, "in X" the
+        location, and the remaining parts are skills when extractor (a SkillExtractor,
+        with the tokenizer it was built with) recognizes them, or free text otherwise.
+        Without an extractor every remaining part is taken as a skill name.
+
+        Returns:
+            Dict of search() keyword arguments
+        """
+        arguments = {'skills': [], 'text': '', 'location': '', 'min_years': None}
+        words = []
+        for part in re.split(r'\s\+\s|,', query):
+            part = part.strip()
+            if not part:
+                continue
+            years = re.fullmatch(r'(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)(?:\s+of\s+experience)?', part, re.IGNORECASE)
+            location = re.fullmatch(r'(?:in|located in|near)\s+(.+)', part, re.IGNORECASE)
+            if years:
+                arguments['min_years'] = float(years.group(1))
+            elif location:
+                arguments['location'] = location.group(1)
+            elif extractor is None:
+                arguments['skills'].append(part)
+            else:
+                found = extractor.extract(tokenizer(part))
+                if found:
+                    arguments['skills'].extend(found)
+                else:
+                    words.append(part)
+        arguments['text'] = ' '.join(words)
+        return arguments
+
+    def query(self, query, k=10, extractor=None, tokenizer=None):
+        """search() with the arguments from parse_query()."""
+        return self.search(k=k, **self.parse_query(query, extractor, tokenizer))
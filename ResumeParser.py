@@ -1,17 +1,85 @@
 import spacy
 import re
 import pandas as pd
-import pymupdf
 from spacy.matcher import PhraseMatcher
 from spacy.matcher import Matcher
+from spacy.tokens import Doc
 from spacy.tokens import Span
+from Extractors import ExtractorRegistry, PdfExtractor
+from LayoutSegmenter import LayoutSegmenter
+from SkillExtractor import SkillExtractor
+import asyncio
+import collections
+import contextlib
+import cProfile
+import functools
+import hashlib
+import importlib.util
+import io
+import mmap
+import multiprocessing
+import multiprocessing.connection
 import os
+import pstats
+import queue
+import srsly
+import threading
+import time
+import tracemalloc
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
-try:
-    import pymupdf
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
+# whether PyMuPDF is installed; it is imported only when the first PDF is opened
+PDF_SUPPORT = importlib.util.find_spec('pymupdf') is not None
+
+class ParseTimeout(TimeoutError):
+    """Raised when a resume exceeds ResumeParser.MAX_SECONDS."""
+
+
+def mark_truncated(stats, reason):
+    """Record in stats that a limit ('pages', 'chars' or 'tokens') cut the document short."""
+    if stats is not None and reason not in stats['truncated']:
+        stats['truncated'].append(reason)
+
+
+def _guarded_worker(connection, parser, settings, options):
+    # worker process of ResumeParser.parse_guarded(): parses one path per message until it
+    # receives None, replying with a result record for each
+    for name, value in settings.items():
+        setattr(parser, name, value)
+    parser.warmup()
+    connection.send('ready')
+    while True:
+        path = connection.recv()
+        if path is None:
+            break
+        record = parser.parse_record(path, **options)
+        record['path'] = path
+        connection.send(record)
+    connection.close()
+
+
+@contextlib.contextmanager
+def timed(stats, stage):
+    """Add the wall and CPU time spent in the block to stats['stages'][stage]; no-op if stats is None."""
+    if stats is None:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        timing = stats['stages'].setdefault(stage, {'wall': 0.0, 'cpu': 0.0})
+        timing['wall'] += time.perf_counter() - wall
+        timing['cpu'] += time.thread_time() - cpu
+
+
+def resident_kb():
+    """Current resident set size of this process in KiB, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * mmap.PAGESIZE // 1024
+    except OSError:
+        return None
 
 class MatchEvent:
     PERSON_PATTERN      = [{'POS': 'PROPN', 'ENT_TYPE': 'PERSON'},
@@ -59,11 +127,268 @@ class MatchEvent:
         entity = Span(doc, start, end, label="EVENT")
 
 
+class ContactExtractor:
+    """
+    Compiled-regex extraction of the contact fields that only depend on token shape,
+    run over raw text without any spaCy processing.
+    """
+    EMAIL_REGEX         = r'[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}'
+
+    GIT_URL_REGEX       = r'(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9_.-]+(?:/[A-Za-z0-9_.-]+)*'
+
+    LINKEDIN_URL_REGEX  = r'(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[A-Za-z0-9_%/.-]+'
+
+    # +44 20 7946 0958, +91-98765-43210, +1 (555) 123-4567, ...; the separators never
+    # include a line break, so a number is not continued into the digits of the next line
+    PHONE_INTL_REGEX    = r'\+\d{1,3}[ \t.-]?(?:\(\d{1,4}\)[ \t.-]?)?\d{1,5}(?:[ \t.-]?\d{2,5}){1,4}'
+
+    # 555-123-4567, (555) 123-4567, 555 123 4567, 555.123.4567
+    PHONE_REGEX         = r'(?:\(\d{3}\)[ \t]?|\d{3}[ \t.-]?)\d{3}[ \t.-]?\d{4}'
+
+    # one alternation so the whole text is scanned once; URLs and emails come first so
+    # the digits inside them are never taken for phone numbers
+    CONTACT_REGEX = re.compile(
+        r'(?P<GithubURL>{})|(?P<LinkedInURL>{})|(?P<Email>{})|(?<![\w+])(?:(?P<Phone>{}|{}))(?![\w-])'.format(
+            GIT_URL_REGEX, LINKEDIN_URL_REGEX, EMAIL_REGEX, PHONE_INTL_REGEX, PHONE_REGEX))
+
+    FIELDS = ('Email', 'Phone', 'GithubURL', 'LinkedInURL')
+
+    @classmethod
+    def extract(cls, text, fields=None):
+        """
+        Find the first occurrence of each contact field in text.
+
+        Args:
+            text: Raw resume text, e.g. the output of ResumeParser.get_ttext
+            fields: Subset of FIELDS to look for, all of them by default
+
+        Returns:
+            Dict of field name to matched text, 'Null' for fields not found
+        """
+        fields = cls.FIELDS if fields is None else tuple(fields)
+        found = {field: 'Null' for field in fields}
+        remaining = len(fields)
+        for match in cls.CONTACT_REGEX.finditer(text):
+            field = match.lastgroup
+            if field in found and found[field] == 'Null':
+                found[field] = match.group(field)
+                remaining -= 1
+                if not remaining:
+                    break
+        return found
+
+
+class ParsedResume:
+    """
+    Compact parse result that keeps no spaCy objects. Sections are stored as
+    (start, end) character offsets into the single text buffer instead of as
+    copied strings; see ResumeParser.release().
+    """
+    __slots__ = ('text', 'sections', 'candidate_info', 'skills', 'stats')
+
+    def __init__(self, text, sections, candidate_info, stats=None, skills=None):
+        self.text = text
+        self.sections = sections
+        self.candidate_info = candidate_info
+        self.skills = skills
+        self.stats = stats
+
+    def section(self, title):
+        """Return the text of a section, or None if the resume does not have it."""
+        offsets = self.sections.get(title)
+        return None if offsets is None else self.text[offsets[0]:offsets[1]]
+
+    def to_dict(self):
+        """Return the result in the shape of ResumeParser.parse_information()."""
+        titles = ResumeParser.SECTION_TITLE
+        details = {titles[0]: dict(self.candidate_info)}
+        if titles[1] in self.sections:
+            details[titles[1]] = ResumeParser.clean_text(self.section(titles[1]))
+        if titles[3] in self.sections:
+            details[titles[3]] = ResumeParser.split_entries(self.section(titles[3]))
+        if self.skills is not None:
+            details[titles[2]] = list(self.skills)
+        return details
+
+
+class LazyResume:
+    """
+    Field-on-demand view of one resume, see ResumeParser.open().
+
+    Pages are extracted one at a time and only as far as the requested fields
+    need. Email, Phone and the profile URLs stop at the first page that has them
+    all; FullName and Address stop at the first section heading and run the
+    pipeline on the text before it only (as in fast mode). Sections need every
+    heading, since a heading repeated later replaces an earlier one as in
+    parse_information(), so they read the whole document, but through the
+    tokenizer only. Every value is computed when first asked for and memoized.
+
+    A field the resume does not have can only be ruled out by reading every page;
+    open it with max_pages to bound that.
+    """
+
+    def __init__(self, parser, file_name, disable=None, max_pages=None, max_chars=None, mime_type=None):
+        self.parser = parser
+        self.name = file_name if isinstance(file_name, (str, os.PathLike)) else '<stream>'
+        self.disable = parser.DISABLED_PIPES if disable is None else tuple(disable)
+        self.stats = {'source': file_name if isinstance(file_name, (str, os.PathLike)) else None,
+                      'stages': {}, 'pages': None, 'chars': 0, 'tokens': 0, 'truncated': []}
+        self.pages = parser.iter_page_text(file_name, max_pages, max_chars, self.stats, mime_type)
+        self.text = ''
+        self.complete = False
+        self.values = {}
+        self._segmented = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the document; fields already computed stay available."""
+        self.pages.close()
+
+    def read_page(self):
+        """Extract the next page; returns False once the document is exhausted."""
+        if self.complete:
+            return False
+        try:
+            page = next(self.pages, None)
+        except Exception as e:
+            self.close()
+            raise Exception(f"Error converting {self.name} to text: {str(e)}")
+        if page is None:
+            self.complete = True
+            if not self.text:
+                raise Exception(f"Error converting {self.name} to text: No text extracted from {self.name}")
+            return False
+        self.text += page
+        if self.parser.MAX_TOKENS is not None:
+            limited = self.parser.limit_tokens(self.text, self.stats)
+            if len(limited) < len(self.text):
+                # the rest of the document is past the token limit, as in a full parse
+                self.text = limited
+                self.complete = True
+                self.close()
+        self.stats['chars'] = len(self.text)
+        return True
+
+    def settled(self):
+        """Return the text later pages cannot change: all of it, or up to the last line break."""
+        return self.text if self.complete else self.text[:self.text.rfind('\n') + 1]
+
+    def fields(self):
+        """Return the names get() accepts: the CANDIDATE_INFO ids and SECTION_TITLE[1:]."""
+        return list(dict.fromkeys([info['id'] for info in self.parser.CANDIDATE_INFO] + self.parser.SECTION_TITLE[1:]))
+
+    def get(self, *fields):
+        """
+        Return {field: value} for CANDIDATE_INFO fields and SECTION_TITLE sections.
+
+        Candidate fields are 'Null' when missing, as in parse_information();
+        SummaryText, WorkExperience and ToolsAndTechnologies have their
+        parse_information() form, other sections their text, and missing sections
+        are None.
+
+        Raises:
+            ValueError: If a field is neither a CANDIDATE_INFO id nor a SECTION_TITLE section
+        """
+        known = self.fields()
+        for field in fields:
+            if field not in known:
+                raise ValueError(f"Unknown field: {field}. Fields: {', '.join(known)}")
+        wanted = [field for field in dict.fromkeys(fields) if field not in self.values]
+        contacts = [field for field in wanted if field in ContactExtractor.FIELDS]
+        if contacts:
+            self.find_contacts(contacts)
+        if any(field not in ContactExtractor.FIELDS and field not in self.parser.SECTION_TITLE for field in wanted):
+            self.find_candidate_info()
+        for field in wanted:
+            if field in self.parser.SECTION_TITLE:
+                self.values[field] = self.get_section(field)
+        return {field: self.values[field] for field in fields}
+
+    def __getitem__(self, field):
+        return self.get(field)[field]
+
+    def find_contacts(self, fields):
+        while True:
+            found = ContactExtractor.extract(self.settled(), fields)
+            for field, value in found.items():
+                if value != 'Null' or self.complete:
+                    self.values[field] = value
+            fields = [field for field in fields if field not in self.values]
+            if not fields or not self.read_page():
+                break
+        for field in fields:
+            self.values[field] = ContactExtractor.extract(self.text, [field])[field]
+
+    def find_candidate_info(self):
+        # FullName and Address come from the text before the first heading
+        parser, nlp = self.parser, self.parser.nlp
+        while True:
+            data = nlp.make_doc(self.settled())
+            matches = parser.get_heading_matcher()(data)
+            if matches or self.complete:
+                break
+            self.read_page()
+        span = parser.before_heading(data, matches[0][1]) if matches else data[:]
+        with timed(self.stats, 'candidate'):
+            doc = span.as_doc()
+            for name, proc in nlp.pipeline:
+                if name not in self.disable:
+                    doc = proc(doc)
+            matches = sorted(parser.get_candidate_matcher()(doc), key=lambda match: match[1])
+        for info in parser.CANDIDATE_INFO:
+            if info['id'] not in ContactExtractor.FIELDS:
+                self.values.setdefault(info['id'], 'Null')
+        found = set()
+        for match_id, start, end in matches:
+            rule_id = nlp.vocab.strings[match_id]
+            if rule_id not in found:
+                found.add(rule_id)
+                self.values[rule_id] = doc[start:end].text
+
+    def segmented(self):
+        """Return a tokenizer-only ResumeParser over the whole text, built once."""
+        if self._segmented is None:
+            while self.read_page():
+                pass
+            doc = self.parser.nlp.make_doc(self.text)
+            self._segmented = self.parser(self.stats['source'], doc=doc, fast=True, disable=self.disable)
+            self._segmented.stats['pages'] = self.stats['pages']
+        return self._segmented
+
+    def get_section(self, title):
+        resume = self.segmented()
+        titles = self.parser.SECTION_TITLE
+        if title == titles[2]:
+            return resume.get_skills(title).get(title)
+        if title not in resume.section_data:
+            return None
+        if title == titles[1]:
+            return resume.get_summary_text(title)[title]
+        if title == titles[3]:
+            return resume.get_work_experience(title)[title]
+        return resume.section_data[title]
+
+    def section(self, title):
+        """Return the raw text of a section, or None if the resume does not have it."""
+        return self.segmented().section_data.get(title)
+
+
+class LazyModel:
+    """Class attribute that loads the spaCy model the first time it is accessed."""
+
+    def __get__(self, obj, owner):
+        return owner.load_model()
+
 
 class ResumeParser:
 
     @staticmethod
-    def _load_spacy_model(name="en_core_web_sm"):
+    def _load_spacy_model(name="en_core_web_sm", exclude=()):
         """Load a spaCy model, downloading it into the current interpreter if missing.
 
         This helps when the project is opened in a different Python environment (for
@@ -71,20 +396,66 @@ class ResumeParser:
         installed yet.
         """
         try:
-            return spacy.load(name)
+            return spacy.load(name, exclude=list(exclude))
         except OSError:
             # Try to download the model into the active interpreter and retry
             try:
                 from spacy.cli import download
                 print(f"spaCy model '{name}' not found in this environment - downloading now...")
                 download(name)
-                return spacy.load(name)
+                return spacy.load(name, exclude=list(exclude))
             except Exception as e:
                 # re-raise with a clearer message
                 raise OSError(f"Failed to load or download spaCy model '{name}': {e}")
 
-    # load model using a safe loader (this runs at import / class-definition time)
-    nlp = _load_spacy_model.__func__()
+    # spaCy model and pipeline components left out when loading it, see configure()
+    MODEL_NAME = 'en_core_web_sm'
+    MODEL_EXCLUDE = ()
+
+    # the model is loaded on first use of ResumeParser.nlp / self.nlp, not at import
+    nlp = LazyModel()
+    _model = None
+    _model_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, model_name=None, exclude=None):
+        """
+        Choose the spaCy model used by the parser. Any model already loaded is
+        dropped and the new one is loaded on next use.
+
+        Args:
+            model_name: spaCy package name or path, e.g. 'en_core_web_md'
+            exclude: Pipeline component names not to load, e.g. ['parser']
+        """
+        with cls._model_lock:
+            if model_name is not None:
+                cls.MODEL_NAME = model_name
+            if exclude is not None:
+                cls.MODEL_EXCLUDE = tuple(exclude)
+            cls._model = None
+
+    @classmethod
+    def load_model(cls):
+        """Return the shared spaCy model, loading it if this is the first use."""
+        model = cls._model
+        if model is None:
+            with cls._model_lock:
+                if cls._model is None:
+                    cls._model = cls._load_spacy_model(cls.MODEL_NAME, exclude=cls.MODEL_EXCLUDE)
+                model = cls._model
+        return model
+
+    @classmethod
+    def warmup(cls):
+        """
+        Pay the model loading cost up front, e.g. when a long-lived service starts,
+        so that the first resume parsed does not. The heading and candidate
+        matchers and the skill gazetteer are compiled here too.
+        """
+        cls.load_model()
+        cls.get_heading_matcher()
+        cls.get_candidate_matcher()
+        cls.get_skill_extractor()
 
     CANDIDATE_INFO = [{'id': 'FullName',    'match_on': MatchEvent.full_name_event, 'pattern': MatchEvent.PERSON_PATTERN},
                       {'id': 'Email',       'match_on': None,                       'pattern': MatchEvent.EMAIL_ID_PATTERN},
@@ -99,25 +470,684 @@ class ResumeParser:
 
     SECTION_INFO_FILE = './section_title.csv'
 
+    # skill taxonomy (Skill and Alias columns) for the ToolsAndTechnologies results, see
+    # get_skill_extractor(); None turns skill extraction off
+    SKILL_TAXONOMY_FILE = './skill_taxonomy.csv'
+
+    # where skills are looked for: 'section' (ToolsAndTechnologies only) or 'text' (the whole resume)
+    SKILL_SCOPE = 'section'
+
+    # optional file the compiled skill gazetteer is saved to, see get_skill_extractor()
+    SKILL_CACHE_FILE = None
+
+    # input formats by extension / MIME type (PDF, DOCX, TXT), see Extractors.py
+    EXTRACTORS = ExtractorRegistry.default()
+
+    # caps on how much of a PDF get_ttext reads, None for no limit
+    MAX_PAGES = None
+    MAX_CHARS = None
+
+    # cap on the tokens sent through the pipeline; longer texts are cut at a token boundary
+    MAX_TOKENS = None
+
+    # characters per token limit_tokens() tokenizes first; more are read if they hold fewer tokens
+    CHARS_PER_TOKEN = 8
+
+    # per-resume wall time budget in seconds, checked between stages (ParseTimeout); see
+    # parse_guarded() for a hard limit that kills stuck workers
+    MAX_SECONDS = None
+
+    # bump whenever a change to the parsing logic alters results, so cached parses are not reused
+    PARSER_VERSION = '5'
+
+    # pipeline components none of the MatchEvent patterns consult; POS, ENT_TYPE, LEMMA and
+    # token shape are all set without them, so they are skipped on every nlp() call
+    DISABLED_PIPES = ('parser', 'senter')
+
+    # called with each resume's stats (see __init__) when parse_information() or release()
+    # finishes, e.g. to feed a metrics exporter
+    METRICS_HOOK = None
+
+    # optional file the tokenized heading aliases are saved to, see get_heading_matcher()
+    HEADING_CACHE_FILE = None
+
     PROFILE_INFORMATION = {}
 
-    def __init__(self, file_name):
-        self.txt = self.get_ttext(file_name)
-        # ensure SECTION_INFO_FILE resolves relative to this file
-        if not os.path.isabs(self.SECTION_INFO_FILE):
-            self.SECTION_INFO_FILE = os.path.join(os.path.dirname(__file__), self.SECTION_INFO_FILE)
+    # heading PhraseMatcher shared by every instance, rebuilt when SECTION_INFO_FILE changes
+    _section_info = None
+    _heading_aliases = None
+    _heading_matcher = None
+    _heading_digest = None
+    _heading_vocab = None
+
+    # CANDIDATE_INFO Matcher, compiled once per model
+    _candidate_matcher = None
+    _candidate_vocab = None
+
+    # SkillExtractor for SKILL_TAXONOMY_FILE, compiled once per tokenizer
+    _skill_taxonomy = None
+    _skill_extractor = None
+    _skill_digest = None
+    _skill_tokenizer = None
+
+    _matcher_lock = threading.Lock()
+
+    def __init__(self, file_name, doc=None, fast=False, disable=None, layout=False, headings=None, mime_type=None):
+        # file_name: path to a PDF, or the PDF as bytes / a file-like object (see get_ttext);
+        # mime_type: format of in-memory input, see get_ttext
+        # fast: segment with the tokenizer alone, the heavy components run only on the
+        # CandidateInformation span; disable: components to skip, default DISABLED_PIPES
+        # layout: find headings from the PDF layout (see get_layout_text); headings: the
+        # heading offsets that go with an already processed layout doc
+        self.fast = fast
+        self.disable = self.DISABLED_PIPES if disable is None else tuple(disable)
+
+        # per-stage wall/CPU seconds and document sizes, filled in as the parse runs; with a
+        # Doc from the batch runners only the stages after nlp.pipe are timed here
+        self.stats = {'source': file_name if isinstance(file_name, (str, os.PathLike)) else None,
+                      'stages': {}, 'pages': None, 'chars': 0, 'tokens': 0, 'truncated': []}
+        self.rss_start = resident_kb()
+        self.deadline = None if self.MAX_SECONDS is None else time.perf_counter() + self.MAX_SECONDS
+
+        # an already processed Doc (e.g. from nlp.pipe) skips extraction and the NLP pass
+        if doc is not None:
+            self.txt = doc.text
+        elif layout:
+            self.txt, headings = self.get_layout_text(file_name, stats=self.stats)
+        else:
+            self.txt = self.get_ttext(file_name, stats=self.stats, mime_type=mime_type)
+        if doc is None:
+            self.check_budget('extract')
+            nlp = self.nlp  # a first-use model load is not counted as NLP time
+            self.txt = self.limit_tokens(self.txt, self.stats)
+            with timed(self.stats, 'nlp'):
+                doc = nlp.make_doc(self.txt) if fast else nlp(self.txt, disable=self.disable)
+            self.check_budget('nlp')
+        self.doc = doc
+        with timed(self.stats, 'segment'):
+            if layout:
+                self.section_spans = self.sections_from_headings(self.doc, headings)
+            else:
+                self.section_spans = self.split_sections(self.doc)
+            self.section_data = {title: span.text for title, span in self.section_spans.items()}
+        self.stats['chars'] = len(self.txt)
+        self.stats['tokens'] = len(self.doc)
+
+    @classmethod
+    def parse_many(cls, paths, batch_size=32, n_process=1, fast=False, disable=None, cache=None,
+                   compact=False, layout=False, duplicates=None, doc_store=None):
+        """
+        Parse a batch of resumes, streaming results as they finish.
+
+        Extracted texts are fed through ``nlp.pipe`` in batches; with n_process > 1
+        the spaCy work is spread across worker processes. A file that fails is
+        reported on its own and does not abort the rest of the batch.
+
+        Args:
+            paths: Iterable of PDF paths (or bytes / file-like objects)
+            batch_size: Number of texts sent through the pipeline at a time
+            n_process: Number of processes used for the spaCy work
+            fast: Tokenize only in nlp.pipe and annotate just the candidate span
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            cache: Optional ParseCache; files already in it skip extraction and NLP
+            compact: Yield ParsedResume objects (see release()) instead of dicts and
+                free the strings the run adds to the vocab; not combinable with cache
+            layout: Find headings from the PDF layout, see get_layout_text()
+            duplicates: Optional DuplicateIndex; a resume whose text nearly matches one
+                parsed earlier with the same settings gets that earlier result without
+                running the spaCy stages, and the pair is recorded in duplicates.matches
+            doc_store: Optional DocStore that keeps each resume's Doc and result so
+                that heading changes can be applied later with resegment(); not
+                combinable with layout
+
+        Yields:
+            (path, details, error) tuples. details has the same shape as
+            parse_information() and error is None on success; on failure details
+            is None and error is the exception raised for that file.
+        """
+        if disable is None:
+            disable = cls.DISABLED_PIPES
+        if compact and (cache is not None or duplicates is not None):
+            raise ValueError("compact results keep the resume text, which cached results do not have")
+        if layout and doc_store is not None:
+            raise ValueError("layout headings come from the PDF, so stored Docs cannot be re-segmented")
+        fingerprint = None if cache is None and duplicates is None else cls.fingerprint(fast, disable, layout)
+        # cache hits and failed files, reported without going through nlp.pipe
+        finished = collections.deque()
+
+        def extracted():
+            for path in paths:
+                try:
+                    source, key, details, mime_type = cls._cache_lookup(path, cache, fingerprint)
+                    if details is not None:
+                        finished.append((path, details, None))
+                        continue
+                    text, headings = cls.extract(source, layout, mime_type)
+                    yield text, (path, key, headings)
+                except Exception as e:
+                    finished.append((path, None, e))
+
+        return cls._parse_extracted(extracted(), finished, batch_size, n_process, fast, disable, cache, compact,
+                                    layout, duplicates, fingerprint, doc_store)
+
+    @classmethod
+    def parse_pipelined(cls, paths, extract_workers=4, n_process=1, queue_size=64, batch_size=32,
+                        extract_processes=False, fast=False, disable=None, cache=None, compact=False,
+                        layout=False, duplicates=None, doc_store=None):
+        """
+        Parse a batch of resumes with PDF extraction and NLP running as overlapping stages.
+
+        A producer thread hands files to a pool of extract_workers running get_ttext
+        (threads, or processes with extract_processes=True). Extracted texts reach the
+        NLP stage, which works like parse_many(), through a queue. At most queue_size
+        files are being extracted or waiting for NLP at any time, so a slow NLP stage
+        holds back extraction and memory stays bounded on large directories.
+
+        Args:
+            paths: Iterable of PDF paths (or bytes / file-like objects)
+            extract_workers: Number of extraction workers
+            n_process: Number of processes used for the spaCy work
+            queue_size: Maximum number of files in flight between the two stages
+            batch_size: Number of texts sent through the pipeline at a time
+            extract_processes: Use a process pool instead of threads for extraction
+            fast: See parse_many()
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            cache: Optional ParseCache
+            compact: See parse_many()
+            layout: See parse_many()
+            duplicates: Optional DuplicateIndex, see parse_many()
+            doc_store: Optional DocStore, see parse_many()
+
+        Yields:
+            (path, details, error) tuples as in parse_many(), in completion order
+        """
+        if disable is None:
+            disable = cls.DISABLED_PIPES
+        if compact and (cache is not None or duplicates is not None):
+            raise ValueError("compact results keep the resume text, which cached results do not have")
+        if layout and doc_store is not None:
+            raise ValueError("layout headings come from the PDF, so stored Docs cannot be re-segmented")
+        fingerprint = None if cache is None and duplicates is None else cls.fingerprint(fast, disable, layout)
+        finished = collections.deque()
+        slots = threading.Semaphore(queue_size)
+        stop = threading.Event()
+        extracted_queue = queue.Queue()
+        done = object()
+
+        def produce():
+            executor = ProcessPoolExecutor if extract_processes else ThreadPoolExecutor
+            try:
+                with executor(max_workers=extract_workers) as pool:
+                    for path in paths:
+                        slots.acquire()
+                        if stop.is_set():
+                            break
+                        try:
+                            source, key, details, mime_type = cls._cache_lookup(path, cache, fingerprint)
+                        except Exception as e:
+                            extracted_queue.put((path, None, None, e))
+                            continue
+                        if details is not None:
+                            extracted_queue.put((path, key, details, None))
+                            continue
+                        future = pool.submit(cls.extract, source, layout, mime_type)
+                        future.add_done_callback(
+                            lambda f, path=path, key=key: extracted_queue.put((path, key, f, None)))
+            except Exception as e:
+                extracted_queue.put((None, None, None, e))
+            finally:
+                extracted_queue.put(done)
+
+        def extracted():
+            while True:
+                item = extracted_queue.get()
+                if item is done:
+                    return
+                slots.release()
+                path, key, result, error = item
+                if isinstance(result, Future):
+                    error = result.exception()
+                    if error is None:
+                        text, headings = result.result()
+                        yield text, (path, key, headings)
+                        continue
+                    result = None
+                finished.append((path, result, error))
+
+        producer = threading.Thread(target=produce, name='resume-extract', daemon=True)
+        producer.start()
+        try:
+            yield from cls._parse_extracted(extracted(), finished, batch_size, n_process, fast, disable, cache,
+                                            compact, layout, duplicates, fingerprint, doc_store)
+        finally:
+            # unblock the producer if the caller stops iterating early
+            stop.set()
+            slots.release()
+
+    # class attributes copied into the parse_guarded() worker processes
+    GUARDED_SETTINGS = ('MODEL_NAME', 'MODEL_EXCLUDE', 'SECTION_INFO_FILE', 'HEADING_CACHE_FILE', 'DISABLED_PIPES',
+                        'SKILL_TAXONOMY_FILE', 'SKILL_SCOPE', 'SKILL_CACHE_FILE', 'EXTRACTORS',
+                        'MAX_PAGES', 'MAX_CHARS', 'MAX_TOKENS', 'CHARS_PER_TOKEN', 'MAX_SECONDS')
+
+    @classmethod
+    def parse_guarded(cls, paths, timeout=60.0, workers=2, fast=False, disable=None, layout=False):
+        """
+        Parse resumes in worker processes with a hard time limit per resume.
+
+        Each worker loads the model once and parses one resume at a time. A resume
+        that is still running after timeout seconds (e.g. stuck inside pymupdf or
+        nlp() on a pathological PDF) gets its worker killed and replaced, and comes
+        back as a 'timeout' record instead of holding up the batch. MAX_PAGES,
+        MAX_CHARS, MAX_TOKENS and MAX_SECONDS apply inside the workers as well.
+
+        Args:
+            paths: Iterable of PDF paths (or bytes)
+            timeout: Wall seconds a worker may spend on one resume
+            workers: Number of worker processes
+            fast: See parse_many()
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            layout: See parse_many()
+
+        Yields:
+            Dicts with the keys path, status ('ok', 'truncated', 'timeout' or
+            'failed'), result (the parse_information() dict or None), error,
+            truncated (the limits that cut the resume short) and seconds, in
+            completion order
+
+        Raises:
+            RuntimeError: If a worker process dies before it is ready, e.g. because
+            the model cannot be loaded
+        """
+        context = multiprocessing.get_context('spawn')
+        settings = {name: getattr(cls, name) for name in cls.GUARDED_SETTINGS}
+        options = {'fast': fast, 'disable': disable, 'layout': layout}
+
+        def start_worker():
+            receiver, sender = context.Pipe()
+            process = context.Process(target=_guarded_worker, args=(sender, cls, settings, options),
+                                      name='resume-guarded', daemon=True)
+            process.start()
+            sender.close()
+            return process, receiver
+
+        def stop_worker(worker, kill=False):
+            process, connection = worker
+            if kill:
+                process.kill()
+            else:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                process.join(5)
+                if process.is_alive():
+                    process.kill()
+            process.join()
+            connection.close()
+
+        starting = {}  # connection -> worker, until the worker reports it is ready
+        idle = []
+        busy = {}      # connection -> (worker, path, start time)
+        for _ in range(max(workers, 1)):
+            worker = start_worker()
+            starting[worker[1]] = worker
+        pending = iter(paths)
+        exhausted = False
+        try:
+            while True:
+                while idle and not exhausted:
+                    path = next(pending, None)
+                    if path is None:
+                        exhausted = True
+                        break
+                    worker = idle.pop()
+                    worker[1].send(path)
+                    busy[worker[1]] = (worker, path, time.perf_counter())
+                if not busy and (exhausted or not starting):
+                    break
+
+                wait_for = None
+                if busy:
+                    first_deadline = min(started for worker, path, started in busy.values()) + timeout
+                    wait_for = max(first_deadline - time.perf_counter(), 0.0)
+                for connection in multiprocessing.connection.wait(list(starting) + list(busy), timeout=wait_for):
+                    if connection in starting:
+                        worker = starting.pop(connection)
+                        try:
+                            connection.recv()
+                        except EOFError:
+                            stop_worker(worker, kill=True)
+                            raise RuntimeError(f"Resume worker exited with code {worker[0].exitcode} "
+                                               f"while loading {cls.MODEL_NAME}")
+                        idle.append(worker)
+                        continue
+                    worker, path, started = busy.pop(connection)
+                    try:
+                        record = connection.recv()
+                        idle.append(worker)
+                    except EOFError:
+                        # the worker crashed on this resume, e.g. in a PDF library segfault
+                        stop_worker(worker, kill=True)
+                        record = {'path': path, 'status': 'failed', 'result': None,
+                                  'error': f"Resume worker exited with code {worker[0].exitcode}",
+                                  'truncated': [], 'seconds': time.perf_counter() - started}
+                        replacement = start_worker()
+                        starting[replacement[1]] = replacement
+                    yield record
+
+                now = time.perf_counter()
+                for connection, (worker, path, started) in list(busy.items()):
+                    if now - started >= timeout:
+                        del busy[connection]
+                        stop_worker(worker, kill=True)
+                        replacement = start_worker()
+                        starting[replacement[1]] = replacement
+                        yield {'path': path, 'status': 'timeout', 'result': None,
+                               'error': f"Parse exceeded {timeout}s, worker killed",
+                               'truncated': [], 'seconds': now - started}
+        finally:
+            for worker in idle:
+                stop_worker(worker)
+            for worker in list(starting.values()) + [entry[0] for entry in busy.values()]:
+                stop_worker(worker, kill=True)
+
+    @classmethod
+    def parse_record(cls, file_name, fast=False, disable=None, layout=False):
+        """
+        Parse one resume and report the outcome as a record instead of raising.
+
+        Returns:
+            Dict with the keys of the parse_guarded() records; path is None for
+            bytes and file-like inputs, so their content is not sent back
+        """
+        start = time.perf_counter()
+        record = {'path': file_name if isinstance(file_name, (str, os.PathLike)) else None,
+                  'status': 'ok', 'result': None, 'error': None, 'truncated': []}
+        try:
+            resume = cls(file_name, fast=fast, disable=disable, layout=layout)
+            record['result'] = resume.parse_information()
+            record['truncated'] = resume.stats['truncated']
+            if record['truncated']:
+                record['status'] = 'truncated'
+        except ParseTimeout as e:
+            record.update(status='timeout', error=str(e))
+        except Exception as e:
+            record.update(status='failed', error=str(e))
+        record['seconds'] = time.perf_counter() - start
+        return record
+
+    # threads of the executor parse_async() uses when none is given
+    ASYNC_WORKERS = 2
+    _async_executor = None
+
+    @classmethod
+    async def parse_async(cls, file_name, executor=None, fast=False, disable=None, cache=None, layout=False):
+        """
+        Parse one resume from a coroutine without blocking the event loop.
+
+        Extraction and NLP run in executor, by default a shared pool of
+        ASYNC_WORKERS threads. Threads keep one copy of the model but share the GIL;
+        a ProcessPoolExecutor runs parses in parallel (cache cannot be passed to
+        one), and ParseService serves a forked pool over HTTP.
+
+        Args:
+            file_name: Path to PDF file, or its content as bytes or a file-like object
+            executor: concurrent.futures executor to run the parse in
+            fast, disable, cache, layout: See parse_file()
+
+        Returns:
+            Dict in the shape of parse_information()
+        """
+        if executor is None:
+            executor = cls.async_executor()
+        call = functools.partial(cls.parse_file, file_name, fast=fast, disable=disable, cache=cache, layout=layout)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    @classmethod
+    def async_executor(cls):
+        """Return the thread pool parse_async() uses by default, creating it on first use."""
+        with cls._model_lock:
+            if cls._async_executor is None:
+                cls._async_executor = ThreadPoolExecutor(max_workers=cls.ASYNC_WORKERS,
+                                                         thread_name_prefix='resume-async')
+            return cls._async_executor
+
+    @classmethod
+    def extract(cls, file_name, layout=False, mime_type=None):
+        """Return (text, headings) for the batch runners; headings is None unless layout."""
+        if layout:
+            return cls.get_layout_text(file_name)
+        return cls.get_ttext(file_name, mime_type=mime_type), None
+
+    @classmethod
+    def limit_tokens(cls, text, stats=None):
+        """
+        Cut text after MAX_TOKENS tokens (tokenizer only); returns text unchanged if no
+        limit is set.
+
+        Only a prefix of the text is tokenized, doubled until it holds the cut, so the
+        cost depends on MAX_TOKENS rather than on the length of the text. The tokenizer
+        splits at whitespace first, so the tokens before a prefix's last whitespace are
+        the tokens of the full text. Text beyond nlp.max_length, which nlp() refuses,
+        is cut too.
+        """
+        if cls.MAX_TOKENS is None:
+            return text
+        nlp = cls.nlp
+        size = min(max(cls.MAX_TOKENS * cls.CHARS_PER_TOKEN, 1024), nlp.max_length)
+        while True:
+            prefix = text[:size]
+            tokens = nlp.make_doc(prefix)
+            if len(prefix) == len(text):
+                if len(tokens) <= cls.MAX_TOKENS:
+                    return text
+                cut = tokens[cls.MAX_TOKENS].idx
+                break
+            settled = max(prefix.rfind(' '), prefix.rfind('\n'))
+            if len(tokens) > cls.MAX_TOKENS and tokens[cls.MAX_TOKENS].idx < settled:
+                cut = tokens[cls.MAX_TOKENS].idx
+                break
+            if size >= nlp.max_length:
+                cut = settled if settled > 0 else size
+                break
+            size = min(size * 2, nlp.max_length)
+        mark_truncated(stats, 'tokens')
+        return text[:cut]
+
+    def check_budget(self, stage):
+        """Raise ParseTimeout if this resume has used up MAX_SECONDS by the end of stage."""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ParseTimeout(f"Parse exceeded {self.MAX_SECONDS}s during {stage}")
+
+    @classmethod
+    def _cache_lookup(cls, file_name, cache, fingerprint):
+        # returns (source to extract from, cache key, cached details or None, MIME type of source)
+        if cache is None:
+            return file_name, None, None, None
+        mime_type = cls.source_mime_type(file_name)
+        source = cls.read_source(file_name)
+        key = cache.key(source, fingerprint)
+        return source, key, cache.get(key), mime_type
+
+    @classmethod
+    def source_mime_type(cls, file_name):
+        """
+        Return the MIME type of a path's format, so its format is kept once it is read
+        into bytes (bytes carry no extension); None for in-memory input, or if the
+        path's extractor declares no MIME type.
+
+        Raises:
+            ValueError: If the extension is not supported
+        """
+        if not isinstance(file_name, (str, os.PathLike)):
+            return None
+        mime_types = cls.EXTRACTORS.for_source(file_name).MIME_TYPES
+        return mime_types[0] if mime_types else None
+
+    @classmethod
+    def _parse_extracted(cls, extracted, finished, batch_size, n_process, fast, disable, cache, compact=False,
+                         layout=False, duplicates=None, fingerprint=None, doc_store=None):
+        # NLP stage shared by the batch runners: extracted yields (text, (path, cache key, headings));
+        # finished collects results that bypass nlp.pipe (cache hits, near-duplicates and failures)
+        nlp = cls.nlp
+        if doc_store is not None:
+            heading_digest = cls.read_section_info()[0]
+            doc_store.save_headings(heading_digest, cls.heading_pairs())
+
+        def limited():
+            # near-duplicates and MAX_TOKENS are handled here, in the consuming thread, so
+            # extraction workers never need the index or the model
+            for text, (path, key, headings) in extracted:
+                entry = None
+                if duplicates is not None:
+                    label = os.fspath(path) if isinstance(path, (str, os.PathLike)) else None
+                    details, entry = duplicates.check(label, text, fingerprint)
+                    if details is not None:
+                        finished.append((path, details, None))
+                        continue
+                stats = {'truncated': []}
+                text = cls.limit_tokens(text, stats)
+                yield text, (path, key, headings, stats['truncated'], entry)
+
+        # compact results hold only plain Python strings, so the vocab strings this run
+        # adds can be freed when it ends
+        with cls._memory_zone() if compact else contextlib.nullcontext():
+            docs = nlp.pipe(limited(), as_tuples=True, batch_size=batch_size, n_process=n_process,
+                            disable=nlp.pipe_names if fast else disable)
+            for doc, (path, key, headings, truncated, entry) in docs:
+                while finished:
+                    yield finished.popleft()
+                try:
+                    parser = cls(path, doc=doc, fast=fast, disable=disable, layout=layout, headings=headings)
+                    parser.stats['truncated'] = truncated
+                    details = parser.release() if compact else parser.parse_information()
+                    if cache is not None:
+                        cache.put(key, details)
+                    if entry is not None:
+                        duplicates.set_details(entry, fingerprint, details)
+                    if doc_store is not None and isinstance(path, (str, os.PathLike)):
+                        doc_store.put(os.fspath(path), doc, fast, heading_digest,
+                                      details.to_dict() if compact else details)
+                    result = (path, details, None)
+                except Exception as e:
+                    result = (path, None, e)
+                yield result
+
+        while finished:
+            yield finished.popleft()
+
+    @classmethod
+    def open(cls, file_name, disable=None, max_pages=None, max_chars=None, mime_type=None):
+        """
+        Open a resume for field-on-demand parsing: nothing is extracted or processed
+        until a field is asked for, and then only as much as that field needs.
+
+            ResumeParser.open(path).get('Email', 'Phone')
+
+        Args:
+            file_name: Path to the resume, or its content as bytes or a file-like object
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            max_pages, max_chars, mime_type: See get_ttext()
+
+        Returns:
+            LazyResume
+        """
+        return LazyResume(cls, file_name, disable=disable, max_pages=max_pages, max_chars=max_chars,
+                          mime_type=mime_type)
+
+    @classmethod
+    def parse_contacts(cls, file_name, max_pages=None, max_chars=None):
+        """
+        Contacts-only parse: extract the text and run ContactExtractor over it. No spaCy
+        model is loaded and no NLP runs, so this suits high-volume dedup and routing.
 
-        self.doc = ResumeParser.nlp(self.txt)
-        self.matcher = Matcher(self.doc.vocab, validate=True)
-        self.section_data = self.load_data(self.doc)
+        Args:
+            file_name: Path to PDF file, or its content as bytes or a file-like object
+            max_pages: See get_ttext()
+            max_chars: See get_ttext()
+
+        Returns:
+            {'CandidateInformation': {field: value}} for ContactExtractor.FIELDS
+        """
+        text = cls.get_ttext(file_name, max_pages=max_pages, max_chars=max_chars)
+        return {cls.SECTION_TITLE[0]: ContactExtractor.extract(text)}
+
+    @classmethod
+    def parse_file(cls, file_name, fast=False, disable=None, cache=None, layout=False):
+        """
+        Parse one resume, serving it from cache when the same bytes were parsed before
+        with the same configuration.
+
+        Args:
+            file_name: Path to PDF file, or its content as bytes or a file-like object
+            fast: See __init__
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            cache: Optional ParseCache
+            layout: Find headings from the PDF layout, see get_layout_text()
+
+        Returns:
+            Dict in the shape of parse_information()
+        """
+        if cache is None:
+            return cls(file_name, fast=fast, disable=disable, layout=layout).parse_information()
+
+        mime_type = cls.source_mime_type(file_name)
+        data = cls.read_source(file_name)
+        key = cache.key(data, cls.fingerprint(fast, disable, layout))
+        details = cache.get(key)
+        if details is None:
+            details = cls(data, fast=fast, disable=disable, layout=layout, mime_type=mime_type).parse_information()
+            cache.put(key, details)
+        return details
+
+    @staticmethod
+    def read_source(file_name):
+        """Return the raw bytes of a path, bytes-like or file-like input."""
+        if isinstance(file_name, (str, os.PathLike)):
+            if not os.path.exists(file_name):
+                raise FileNotFoundError(f"File not found: {file_name}")
+            with open(file_name, 'rb') as f:
+                return f.read()
+        if isinstance(file_name, (bytes, bytearray, memoryview)):
+            return bytes(file_name)
+        return file_name.read()
+
+    @classmethod
+    def fingerprint(cls, fast=False, disable=None, layout=False):
+        """
+        Return a string identifying everything besides the input that shapes a parse
+        result: parser version, model name and version, heading CSV content and the
+        pipeline options. Used as part of ParseCache keys; the model is not loaded.
+        """
+        model_version = spacy.util.get_package_version(cls.MODEL_NAME)
+        if model_version is None and os.path.isdir(cls.MODEL_NAME):
+            model_version = srsly.read_json(os.path.join(cls.MODEL_NAME, 'meta.json')).get('version')
+        disable = cls.DISABLED_PIPES if disable is None else disable
+        skills = 'no-skills' if cls.SKILL_TAXONOMY_FILE is None else cls.read_skill_taxonomy()[0] + cls.SKILL_SCOPE
+        return '|'.join([cls.PARSER_VERSION, cls.MODEL_NAME, str(model_version), cls.read_section_info()[0],
+                         skills, 'fast' if fast else 'full', 'layout' if layout else 'text',
+                         ','.join(sorted(disable)), str(cls.MAX_PAGES), str(cls.MAX_CHARS),
+                         str(cls.MAX_TOKENS)])
 
     # Converting Docx/PDF to txt
-    def get_ttext(self, file_name):
+    @classmethod
+    def get_ttext(cls, file_name, max_pages=None, max_chars=None, stats=None, mime_type=None):
         """
-        Convert a PDF file to plain text. This parser is configured for PDF-only input.
+        Convert a PDF, DOCX or TXT resume to plain text, see EXTRACTORS.
+
+        Page texts are extracted one at a time and joined once at the end. Extraction
+        stops early at max_pages pages or max_chars characters, so oversized uploads
+        cannot exhaust memory.
 
         Args:
-            file_name: Path to PDF file
+            file_name: Path to the resume, or its content as bytes, bytearray,
+                memoryview or a binary file-like object
+            max_pages: Maximum number of pages to read, defaults to MAX_PAGES
+            max_chars: Maximum number of characters to return, defaults to MAX_CHARS
+            stats: Optional stats dict (see __init__) that receives the 'open' and
+                'extract' timings and the page count
+            mime_type: Format of the input, by default taken from the file extension
+                (or, for in-memory input, from its leading bytes)
 
         Returns:
             Extracted text as string
@@ -126,67 +1156,413 @@ class ResumeParser:
             FileNotFoundError: If file doesn't exist
             ValueError: If file format is not supported or extraction fails
         """
+        name = file_name if isinstance(file_name, (str, os.PathLike)) else '<stream>'
         try:
-            if not os.path.exists(file_name):
-                raise FileNotFoundError(f"File not found: {file_name}")
-            
-            file_ext = os.path.splitext(file_name)[1].lower()
-            
-            if file_ext != '.pdf':
-                raise ValueError(f"Unsupported file format: {file_ext}. This parser accepts only .pdf files")
-
-            # handle PDF
-            import importlib
-            pdf_lib = None
-            
-            if not PDF_SUPPORT:
-                # Try to import at runtime; if still missing, attempt to install into this interpreter.
-                try:
-                    pdf_lib = importlib.import_module('pymupdf')
-                except ImportError:
-                    # Attempt to install into the active interpreter
-                    try:
-                        import sys
-                        import subprocess
-                        print("PyMuPDF not found in this environment. Attempting to install into the active interpreter...")
-                        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'PyMuPDF'])
-                        pdf_lib = importlib.import_module('pymupdf')
-                    except Exception as ie:
-                        raise ValueError("PDF support requires PyMuPDF. Automatic install failed. Please install manually with: python -m pip install PyMuPDF") from ie
-            else:
-                pdf_lib = pymupdf
+            text = ''.join(cls.iter_page_text(file_name, max_pages, max_chars, stats, mime_type))
+            if not text:
+                raise ValueError(f"No text extracted from {name}")
+            return text
+
+        except Exception as e:
+            raise Exception(f"Error converting {name} to text: {str(e)}")
 
-            text = ""
+    @classmethod
+    def iter_page_text(cls, file_name, max_pages=None, max_chars=None, stats=None, mime_type=None):
+        """
+        Yield the text of each page of a resume, see get_ttext() for the arguments.
+        """
+        max_pages = cls.MAX_PAGES if max_pages is None else max_pages
+        max_chars = cls.MAX_CHARS if max_chars is None else max_chars
+
+        with timed(stats, 'open'):
+            extractor, document = cls.open_document(file_name, mime_type)
+        try:
+            remaining = max_chars
+            for index, page in enumerate(extractor.pages(document)):
+                if max_pages is not None and index >= max_pages:
+                    mark_truncated(stats, 'pages')
+                    break
+                if remaining is not None and remaining <= 0:
+                    mark_truncated(stats, 'chars')
+                    break
+                if stats is not None:
+                    stats['pages'] = index + 1
+                with timed(stats, 'extract'):
+                    page_text = extractor.page_text(page)
+                if remaining is not None:
+                    if len(page_text) > remaining:
+                        mark_truncated(stats, 'chars')
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
+                if page_text:
+                    yield page_text
+        finally:
+            extractor.close(document)
+
+    @classmethod
+    def get_layout_text(cls, file_name, max_pages=None, max_chars=None, stats=None):
+        """
+        Convert a PDF to text in layout reading order and locate its section headings
+        from font size, weight and line position, see LayoutSegmenter. Headings must
+        be aliases from SECTION_INFO_FILE.
+
+        Args:
+            file_name: See get_ttext()
+            max_pages: Maximum number of pages to read, defaults to MAX_PAGES
+            max_chars: Maximum number of characters to return, defaults to MAX_CHARS
+            stats: Optional stats dict (see __init__)
+
+        Returns:
+            (text, headings) with headings a list of (section title, start, end)
+            character offsets into text
+        """
+        max_pages = cls.MAX_PAGES if max_pages is None else max_pages
+        max_chars = cls.MAX_CHARS if max_chars is None else max_chars
+        name = file_name if isinstance(file_name, (str, os.PathLike)) else '<stream>'
+        try:
+            with timed(stats, 'open'):
+                pdf_document = cls.open_pdf(file_name)
             try:
-                pdf_document = pdf_lib.open(file_name)
-                for page in pdf_document:
-                    page_text = page.get_text()
-                    if page_text:
-                        text += page_text
+                with timed(stats, 'extract'):
+                    segmenter = LayoutSegmenter(cls.heading_aliases())
+                    text, headings = segmenter.segment(pdf_document, max_pages, max_chars)
+                if stats is not None:
+                    stats['pages'] = segmenter.pages_read
+                if max_pages is not None and pdf_document.page_count > max_pages:
+                    mark_truncated(stats, 'pages')
+                if max_chars is not None and len(text) >= max_chars:
+                    mark_truncated(stats, 'chars')
+            finally:
                 pdf_document.close()
-            except Exception as e:
-                raise ValueError(f"Error reading PDF: {str(e)}")
-            
             if not text:
-                raise ValueError(f"No text extracted from PDF: {file_name}")
-            return text
-        
+                raise ValueError(f"No text extracted from PDF: {name}")
+            return text, headings
+
         except Exception as e:
-            raise Exception(f"Error converting {file_name} to text: {str(e)}")
+            raise Exception(f"Error converting {name} to text: {str(e)}")
+
+    @classmethod
+    def open_document(cls, file_name, mime_type=None):
+        """
+        Open a resume from a path, bytes-like object or binary file-like object with
+        the matching extractor from EXTRACTORS.
+
+        Returns:
+            (extractor, document); the caller closes it with extractor.close(document)
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If the format is not supported or the file cannot be read
+            ImportError: If the format's backend library is not installed
+        """
+        if isinstance(file_name, (str, os.PathLike)) and not os.path.exists(file_name):
+            raise FileNotFoundError(f"File not found: {file_name}")
+        extractor = cls.EXTRACTORS.for_source(file_name, mime_type)
+        return extractor, extractor.open(file_name)
+
+    @classmethod
+    def open_pdf(cls, file_name):
+        """
+        Open a PDF from a path, bytes-like object or binary file-like object.
+
+        Returns:
+            Open pymupdf Document; the caller closes it
+        """
+        extractor, document = cls.open_document(file_name)
+        if not isinstance(extractor, PdfExtractor):
+            extractor.close(document)
+            raise ValueError(f"Layout sections need PDF input, not {extractor.NAME}")
+        return document
+
+    @classmethod
+    def section_info_path(cls):
+        """Return SECTION_INFO_FILE, resolved relative to this file if it is not absolute."""
+        return cls._data_path(cls.SECTION_INFO_FILE)
+
+    @staticmethod
+    def _data_path(path):
+        if os.path.isabs(path):
+            return path
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+    @staticmethod
+    def _read_stamped(path, cached):
+        # returns (stamp, sha1 hex digest, raw bytes), re-reading path only when its mtime or
+        # size differs from the stamp of cached
+        stat = os.stat(path)
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if cached is None or cached[0] != stamp:
+            with open(path, 'rb') as f:
+                data = f.read()
+            cached = (stamp, hashlib.sha1(data).hexdigest(), data)
+        return cached
+
+    @classmethod
+    def get_heading_matcher(cls):
+        """
+        Return the PhraseMatcher for the section headings in SECTION_INFO_FILE.
+
+        The matcher is built once per process from tokenizer-only docs and reused by
+        every resume. It is rebuilt only when the CSV's content hash changes (checked
+        when its mtime does), so edits to the heading aliases are still picked up. When
+        HEADING_CACHE_FILE is set, the tokenized aliases are also saved there and
+        reused by later processes.
+
+        Returns:
+            PhraseMatcher with one rule per section in SECTION_TITLE[1:]
+        """
+        nlp = cls.nlp
+        digest, data = cls.read_section_info()
+        if cls._heading_digest == digest and cls._heading_vocab is nlp.vocab:
+            return cls._heading_matcher
+
+        with cls._matcher_lock:
+            if cls._heading_digest != digest or cls._heading_vocab is not nlp.vocab:
+                cls._heading_matcher = cls._build_heading_matcher(nlp, data, digest)
+                cls._heading_digest = digest
+                cls._heading_vocab = nlp.vocab
+            return cls._heading_matcher
+
+    @classmethod
+    def read_section_info(cls):
+        """
+        Return the (sha1 hex digest, raw bytes) of SECTION_INFO_FILE. The file is
+        re-read only when its mtime or size changes.
+        """
+        cls._section_info = cached = cls._read_stamped(cls.section_info_path(), cls._section_info)
+        return cached[1], cached[2]
+
+    @classmethod
+    def heading_aliases(cls):
+        """
+        Return the SECTION_INFO_FILE aliases as a dict of normalized alias to section
+        title, rebuilt only when the file's content changes.
+        """
+        digest, data = cls.read_section_info()
+        cached = cls._heading_aliases
+        if cached is None or cached[0] != digest:
+            section_dict = pd.read_csv(io.BytesIO(data))
+            aliases = {}
+            for section in cls.SECTION_TITLE[1:]:
+                for alias in section_dict[section].dropna(axis=0):
+                    aliases.setdefault(LayoutSegmenter.normalize(alias), section)
+            cached = (digest, aliases)
+            cls._heading_aliases = cached
+        return cached[1]
+
+    @classmethod
+    def heading_pairs(cls):
+        """Return the SECTION_INFO_FILE aliases as a set of (section title, alias) pairs."""
+        section_dict = pd.read_csv(io.BytesIO(cls.read_section_info()[1]))
+        return {(section, alias) for section in cls.SECTION_TITLE[1:] for alias in section_dict[section].dropna(axis=0)}
+
+    @classmethod
+    def resegment(cls, doc_store, force=False):
+        """
+        Apply the current SECTION_INFO_FILE to resumes kept in a DocStore, without
+        extracting their files or running the pipeline again.
+
+        Only resumes segmented with an older version of the heading CSV are looked
+        at, and of those only the ones whose text contains an alias that was added,
+        removed or moved to another section since are segmented again; the others
+        are just marked as up to date.
+
+        Args:
+            doc_store: DocStore filled by parse_many()/parse_pipelined()
+            force: Re-segment every stored resume
+
+        Yields:
+            (path, details, error) for each resume segmented again, as in parse_many()
+        """
+        nlp = cls.nlp
+        digest = cls.read_section_info()[0]
+        current = cls.heading_pairs()
+        doc_store.save_headings(digest, current)
+        changed_since = {}
+        for path, text, old_digest in doc_store.entries(None if force else digest):
+            if not force:
+                if old_digest not in changed_since:
+                    previous = doc_store.headings(old_digest)
+                    # without the old aliases every alias counts as changed
+                    changed = current if previous is None else previous ^ current
+                    # headings match token by token, whatever the whitespace between them,
+                    # so a resume is only skipped when some word of each changed alias is missing
+                    changed_since[old_digest] = {tuple(re.findall(r'\w+', alias)) for section, alias in changed}
+                if not any(all(word in text for word in words) for words in changed_since[old_digest]):
+                    doc_store.update(path, digest)
+                    continue
+            try:
+                doc, fast, _, _ = doc_store.get(path, nlp.vocab)
+                details = cls(path, doc=doc, fast=fast).parse_information()
+                doc_store.update(path, digest, details)
+                result = (path, details, None)
+            except Exception as e:
+                result = (path, None, e)
+            yield result
+
+    @classmethod
+    def _build_heading_matcher(cls, nlp, data, digest):
+        words = cls._load_heading_cache(digest)
+        if words is None:
+            section_dict = pd.read_csv(io.BytesIO(data))
+            words = {}
+            for section in cls.SECTION_TITLE[1:]:
+                aliases = section_dict[section].dropna(axis=0)
+                words[section] = [[t.text for t in doc] for doc in nlp.tokenizer.pipe(aliases)]
+            cls._save_heading_cache(digest, words)
+
+        matcher = PhraseMatcher(nlp.vocab)
+        for section in cls.SECTION_TITLE[1:]:
+            matcher.add(section, [Doc(nlp.vocab, words=w) for w in words[section]])
+        return matcher
+
+    @classmethod
+    def _load_heading_cache(cls, digest):
+        if not cls.HEADING_CACHE_FILE or not os.path.exists(cls.HEADING_CACHE_FILE):
+            return None
+        try:
+            cached = srsly.read_msgpack(cls.HEADING_CACHE_FILE)
+        except Exception:
+            return None
+        if cached.get('digest') != digest or cached.get('model') != cls.MODEL_NAME:
+            return None
+        return cached['words']
+
+    @classmethod
+    def _save_heading_cache(cls, digest, words):
+        if not cls.HEADING_CACHE_FILE:
+            return
+        try:
+            srsly.write_msgpack(cls.HEADING_CACHE_FILE,
+                                {'digest': digest, 'model': cls.MODEL_NAME, 'words': words})
+        except OSError:
+            # the cache is only an optimization; a read-only location must not fail the parse
+            pass
+
+    @classmethod
+    def get_candidate_matcher(cls):
+        """
+        Return the Matcher for the CANDIDATE_INFO patterns, compiled once per process
+        and shared by every resume. Fields handled by ContactExtractor are left out.
+        """
+        nlp = cls.nlp
+        if cls._candidate_vocab is nlp.vocab:
+            return cls._candidate_matcher
+
+        with cls._matcher_lock:
+            if cls._candidate_vocab is not nlp.vocab:
+                patterns = {}
+                for info in cls.CANDIDATE_INFO:
+                    if info['id'] not in ContactExtractor.FIELDS:
+                        patterns.setdefault(info['id'], []).append(info['pattern'])
+
+                matcher = Matcher(nlp.vocab, validate=True)
+                for rule_id, rule_patterns in patterns.items():
+                    matcher.add(rule_id, rule_patterns, greedy='LONGEST')
+                cls._candidate_matcher = matcher
+                cls._candidate_vocab = nlp.vocab
+            return cls._candidate_matcher
+
+    @classmethod
+    def read_skill_taxonomy(cls):
+        """Return the (sha1 hex digest, raw bytes) of SKILL_TAXONOMY_FILE, see read_section_info()."""
+        cls._skill_taxonomy = cached = cls._read_stamped(cls._data_path(cls.SKILL_TAXONOMY_FILE), cls._skill_taxonomy)
+        return cached[1], cached[2]
+
+    @classmethod
+    def get_skill_extractor(cls):
+        """
+        Return the SkillExtractor for SKILL_TAXONOMY_FILE, or None if it is unset.
+
+        The gazetteer is compiled from tokenizer-only docs once per process and
+        recompiled only when the taxonomy's content changes. When SKILL_CACHE_FILE is
+        set the compiled gazetteer is saved there, and later processes load it in
+        milliseconds instead of tokenizing tens of thousands of terms again.
+        """
+        if cls.SKILL_TAXONOMY_FILE is None:
+            return None
+        nlp = cls.nlp
+        digest, data = cls.read_skill_taxonomy()
+        if cls._skill_digest == digest and cls._skill_tokenizer is nlp.tokenizer:
+            return cls._skill_extractor
+
+        with cls._matcher_lock:
+            if cls._skill_digest != digest or cls._skill_tokenizer is not nlp.tokenizer:
+                extractor = cls._load_skill_cache(digest)
+                if extractor is None:
+                    extractor = SkillExtractor.from_frame(pd.read_csv(io.BytesIO(data)), nlp.tokenizer)
+                    cls._save_skill_cache(digest, extractor)
+                cls._skill_extractor = extractor
+                cls._skill_digest = digest
+                cls._skill_tokenizer = nlp.tokenizer
+            return cls._skill_extractor
+
+    @classmethod
+    def _load_skill_cache(cls, digest):
+        if not cls.SKILL_CACHE_FILE or not os.path.exists(cls.SKILL_CACHE_FILE):
+            return None
+        try:
+            extractor, meta = SkillExtractor.from_disk(cls.SKILL_CACHE_FILE)
+        except Exception:
+            return None
+        if meta.get('digest') != digest or meta.get('model') != cls.MODEL_NAME:
+            return None
+        return extractor
+
+    @classmethod
+    def _save_skill_cache(cls, digest, extractor):
+        if not cls.SKILL_CACHE_FILE:
+            return
+        try:
+            extractor.to_disk(cls.SKILL_CACHE_FILE, digest=digest, model=cls.MODEL_NAME)
+        except OSError:
+            # the cache is only an optimization; a read-only location must not fail the parse
+            pass
+
+    def get_skills(self, title):
+        """
+        Return {title: skills} with the normalized skills found in the ToolsAndTechnologies
+        section (or the whole resume, see SKILL_SCOPE), or {} if skill extraction is off
+        or the section is missing.
+        """
+        extractor = self.get_skill_extractor()
+        if extractor is None:
+            return {}
+        if self.SKILL_SCOPE == 'text':
+            return {title: extractor.extract(self.doc)}
+        if title not in self.section_spans:
+            return {}
+        return {title: extractor.extract(self.section_spans[title])}
 
     def load_data(self, data):
-        section_dict = pd.read_csv(self.SECTION_INFO_FILE)
-        section_words = {}
-        matcher = PhraseMatcher(self.nlp.vocab)
-        for section in self.SECTION_TITLE[1:]:
-            section_words[section] = [self.nlp(text) for text in section_dict[section].dropna(axis=0)]
-            matcher.add(section, section_words[section])
+        return {title: span.text for title, span in self.split_sections(data).items()}
+
+    @staticmethod
+    def before_heading(data, start, begin=0):
+        """
+        Span of data from token begin up to the heading match at token start, without
+        the token right before the heading. Empty rather than wrapping around when the
+        heading is at the start of data.
+        """
+        return data[begin:max(start - 1, begin)]
+
+    def split_sections(self, data):
+        """
+        Split a Doc into sections at the headings found by get_heading_matcher().
+
+        Args:
+            data: Doc to split; only token boundaries are needed
+
+        Returns:
+            Dict of section title to Span of data
+        """
+        matcher = self.get_heading_matcher()
 
         section_data = {}
         matches = matcher(data)
 
         if len(matches) > 0:
-            section_data[self.SECTION_TITLE[0]] = str(data[:matches[0][1]-1])
+            section_data[self.SECTION_TITLE[0]] = self.before_heading(data, matches[0][1])
 
         for index, section in enumerate(matches):
             match_id, start, end = section
@@ -195,65 +1571,198 @@ class ResumeParser:
             if index == len(matches) - 1:
                 span = data[end:]
             else:
-                span = data[end: matches[index + 1][1] - 1]
+                span = self.before_heading(data, matches[index + 1][1], end)
 
             if str(span.text) != '':
-                section_data[rule_id] = str(span.text)
-            #print(rule_id, data[start:end].text)
-            #print('{}    -    {}'.format(rule_id, span.string))
+                section_data[rule_id] = span
+
+        return section_data
+
+    def sections_from_headings(self, data, headings):
+        """
+        Split a Doc into sections at known heading offsets, the layout counterpart of
+        split_sections().
+
+        Args:
+            data: Doc of the text the offsets refer to
+            headings: List of (section title, start, end) character offsets
+
+        Returns:
+            Dict of section title to Span of data
+        """
+        # headings past the end of a truncated text are dropped
+        headings = [heading for heading in headings if heading[2] <= len(data.text)]
+        section_data = {}
+        if headings:
+            span = data.char_span(0, headings[0][1], alignment_mode='contract')
+            section_data[self.SECTION_TITLE[0]] = span if span is not None else data[:0]
+
+        for index, (rule_id, start, end) in enumerate(headings):
+            stop = len(data.text) if index == len(headings) - 1 else headings[index + 1][1]
+            span = data.char_span(end, stop, alignment_mode='contract')
+            if span is not None and span.text.strip() != '':
+                section_data[rule_id] = span
 
         return section_data
 
+    def annotate(self, span):
+        """
+        Return span with the pipeline annotations the candidate patterns need. The
+        full-document pass already provides them; in fast mode only this span is run
+        through the components, reusing its tokens.
+        """
+        if not self.fast:
+            return span
+        doc = span.as_doc()
+        for name, proc in self.nlp.pipeline:
+            if name not in self.disable:
+                doc = proc(doc)
+        return doc
+
     def get_candidate_info(self, title):
         # To store Candidate information
-        candidate_info_details = {}
-        data = self.nlp(self.section_data[title])
+        candidate_info_details = {info['id']: 'Null' for info in self.CANDIDATE_INFO}
 
-        # Adding all the patterns to the Matcher to retrieve the corresponding details
-        for index, info in enumerate(ResumeParser.CANDIDATE_INFO):
-            self.matcher.add(info['id'], [info['pattern']], greedy='LONGEST')
-            candidate_info_details[info['id']] = 'Null'
+        # Email, Phone and profile URLs come from a regex scan of the raw text; spaCy is
+        # only needed for FullName and Address
+        candidate_info_details.update(ContactExtractor.extract(self.txt))
+        data = self.annotate(self.section_spans[title])
 
-        # Extracting the details from document text
-        matches = self.matcher(data)
-
-        # Iterating the result set and store the information
+        # Match offsets are relative to data, the first match per field wins
+        matches = sorted(self.get_candidate_matcher()(data), key=lambda match: match[1])
         for match_id, start, end in matches:
-            rule_id = str(self.nlp.vocab.strings[match_id])
+            rule_id = self.nlp.vocab.strings[match_id]
             if candidate_info_details[rule_id] == 'Null':
-                span = self.doc[start:end]
-                candidate_info_details[rule_id] = str(span.text)
-
-        for key in candidate_info_details:
-           print(key + " : " + candidate_info_details[key])
+                candidate_info_details[rule_id] = data[start:end].text
 
         return {title: candidate_info_details}
 
+    @staticmethod
+    def clean_text(data):
+        return None if data is None else re.sub(r"\s+", " ", data).strip()
+
+    @staticmethod
+    def split_entries(data):
+        return None if data is None else list(filter(None, data.split('\n\n\n')))
+
     def get_summary_text(self, title):
-        data = self.section_data[title]
-        data = None if data is None else re.sub(r"\s+", " ", data).strip()
-        return {title : data}
+        return {title : self.clean_text(self.section_data[title])}
 
     def get_work_experience(self, title):
-        data = self.section_data[title]
-        data = None if data is None else list(filter(None, data.split('\n\n\n')))
-        for i, d in enumerate(data):
-            print('{}----{}'.format(i,re.sub(r"\s+", " ", d).strip()))
-        return {title : data}
+        return {title : self.split_entries(self.section_data[title])}
 
     def parse_information(self):
-        details = self.get_candidate_info(self.SECTION_TITLE[0])
-        
-        # Add summary text if it exists
-        if self.SECTION_TITLE[1] in self.section_data:
-            details.update(self.get_summary_text(self.SECTION_TITLE[1]))
-        
-        # Add work experience if it exists
-        if self.SECTION_TITLE[3] in self.section_data:
-            details.update(self.get_work_experience(self.SECTION_TITLE[3]))
-        
+        self.check_budget('segment')
+        with timed(self.stats, 'candidate'):
+            details = self.get_candidate_info(self.SECTION_TITLE[0])
+
+        with timed(self.stats, 'sections'):
+            # Add summary text if it exists
+            if self.SECTION_TITLE[1] in self.section_data:
+                details.update(self.get_summary_text(self.SECTION_TITLE[1]))
+
+            # Add work experience if it exists
+            if self.SECTION_TITLE[3] in self.section_data:
+                details.update(self.get_work_experience(self.SECTION_TITLE[3]))
+
+            details.update(self.get_skills(self.SECTION_TITLE[2]))
+
+        self.report_stats()
         return details
 
+    def report_stats(self):
+        """Record the memory this parse added in stats and pass them to METRICS_HOOK, once it is done."""
+        rss = resident_kb()
+        if rss is not None and self.rss_start is not None:
+            # resident memory gained since the parser was created (after nlp.pipe for a Doc
+            # from the batch runners); parses running in other threads add to it as well, and
+            # the first parse of a process includes loading the model
+            self.stats['rss_delta_kb'] = rss - self.rss_start
+        # looked up on the class so a plain function is not bound as a method
+        hook = type(self).METRICS_HOOK
+        if hook is not None:
+            hook(self.stats)
+
+    def release(self):
+        """
+        Return a compact ParsedResume and drop everything else this parser holds: the
+        Doc, its section spans and the section string copies. The parser cannot be
+        used again afterwards.
+        """
+        with timed(self.stats, 'candidate'):
+            candidate_info = self.get_candidate_info(self.SECTION_TITLE[0])[self.SECTION_TITLE[0]]
+        with timed(self.stats, 'sections'):
+            skills = self.get_skills(self.SECTION_TITLE[2]).get(self.SECTION_TITLE[2])
+        self.report_stats()
+        sections = {title: (span.start_char, span.end_char) for title, span in self.section_spans.items()}
+        result = ParsedResume(self.txt, sections, candidate_info, self.stats, skills)
+        self.doc = self.section_spans = self.section_data = self.txt = None
+        return result
+
+    @classmethod
+    def parse_compact(cls, file_name, fast=False, disable=None, layout=False):
+        """
+        Parse one resume in release mode, see release(). Strings the parse adds to the
+        shared vocab are freed again where spaCy supports memory zones.
+
+        Returns:
+            ParsedResume
+        """
+        with cls._memory_zone():
+            return cls(file_name, fast=fast, disable=disable, layout=layout).release()
+
+    @classmethod
+    def _memory_zone(cls):
+        # strings interned inside the zone are freed when it exits (spaCy >= 3.8); the
+        # shared matchers are compiled first so their strings stay in the vocab
+        nlp = cls.nlp
+        if not hasattr(nlp, 'memory_zone'):
+            return contextlib.nullcontext()
+        cls.get_heading_matcher()
+        cls.get_candidate_matcher()
+        return nlp.memory_zone()
+
+    @classmethod
+    def profile(cls, file_name, fast=False, disable=None, sort='cumulative', limit=25):
+        """
+        Parse a single resume under cProfile and tracemalloc. Both add noticeable
+        overhead, so this is meant for investigating one document, not for batches.
+
+        Args:
+            file_name: Path to PDF file, or its content as bytes or a file-like object
+            fast: See __init__
+            disable: Pipeline components to skip, defaults to DISABLED_PIPES
+            sort: pstats sort key for the profile report
+            limit: Number of functions / allocation sites to report
+
+        Returns:
+            (details, stats) where stats is the parser's stats dict with 'profile'
+            (pstats report text) and 'tracemalloc' (current/peak bytes traced during
+            the parse and the top allocation sites) added
+        """
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            parser = cls(file_name, fast=fast, disable=disable)
+            details = parser.parse_information()
+        finally:
+            profiler.disable()
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not tracing:
+                tracemalloc.stop()
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+        parser.stats['profile'] = report.getvalue()
+        parser.stats['tracemalloc'] = {'current': current, 'peak': peak,
+                                       'top': [str(stat) for stat in snapshot.statistics('lineno')[:limit]]}
+        return details, parser.stats
+
 
 def main():
     """
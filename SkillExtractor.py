@@ -0,0 +1,145 @@
+import srsly
+
+
+class SkillExtractor:
+    """
+    Gazetteer matcher that maps skill mentions to normalized skill names.
+
+    Every alias in the taxonomy is split with the spaCy tokenizer, and its
+    lower-cased tokens, joined by SEPARATOR, become a key of one flat dict. The
+    key of every proper prefix of an alias goes into a set. Matching extends a key
+    token by token from each position for as long as it is a known prefix, keeps
+    the longest alias found and continues after it. A scan therefore costs
+    O(tokens x longest alias) dict lookups, however many terms the gazetteer
+    holds. Text and aliases are tokenized the same way, so matches always fall on
+    token boundaries ("Java" never matches inside "JavaScript"). Single-token
+    aliases of up to SHORT_ALIAS_LENGTH characters ("Go", "C", "R") match only as
+    written, so the word "go" or an initial "r" is not taken for a skill.
+
+    The compiled gazetteer is two flat string collections, saved with msgpack, so
+    a process loads tens of thousands of terms in a few tens of milliseconds
+    instead of tokenizing them again.
+
+    Args:
+        skills: List of normalized skill names; phrases refer to them by index
+        phrases: Dict of joined alias tokens -> skill index
+        prefixes: Set of joined tokens of every proper alias prefix
+        cased: Dict of short alias token text (case kept) -> skill index
+    """
+
+    # joins the tokens of an alias into a key; never part of a token
+    SEPARATOR = '\x1f'
+
+    # single-token aliases up to this many characters are matched case-sensitively
+    SHORT_ALIAS_LENGTH = 2
+
+    # bump when the saved format changes
+    VERSION = 2
+
+    def __init__(self, skills, phrases, prefixes, cased):
+        self.skills = skills
+        self.phrases = phrases
+        self.prefixes = prefixes
+        self.cased = cased
+
+    @classmethod
+    def build(cls, taxonomy, tokenizer):
+        """
+        Compile a taxonomy.
+
+        Args:
+            taxonomy: Iterable of (skill, alias) pairs; each skill also matches its own name
+            tokenizer: spaCy tokenizer, e.g. nlp.tokenizer
+
+        Returns:
+            SkillExtractor
+        """
+        skills, index, aliases = [], {}, []
+        for skill, alias in taxonomy:
+            skill = skill.strip()
+            if skill not in index:
+                index[skill] = len(skills)
+                skills.append(skill)
+                aliases.append((skill, index[skill]))
+            if alias and alias.strip():
+                aliases.append((alias.strip(), index[skill]))
+
+        phrases, prefixes, cased = {}, set(), {}
+        for doc, (alias, skill_id) in zip(tokenizer.pipe(alias for alias, skill_id in aliases), aliases):
+            tokens = [token for token in doc if not token.is_space]
+            if len(tokens) == 1 and len(tokens[0].text) <= cls.SHORT_ALIAS_LENGTH:
+                cased.setdefault(tokens[0].text, skill_id)
+                continue
+            words = [token.lower_ for token in tokens]
+            for end in range(1, len(words)):
+                prefixes.add(cls.SEPARATOR.join(words[:end]))
+            # the first skill listed for an alias keeps it
+            phrases.setdefault(cls.SEPARATOR.join(words), skill_id)
+        return cls(skills, phrases, prefixes, cased)
+
+    @classmethod
+    def from_frame(cls, frame, tokenizer):
+        """Compile a taxonomy DataFrame with Skill and Alias columns (Alias may be empty)."""
+        aliases = frame['Alias'] if 'Alias' in frame else [None] * len(frame)
+        return cls.build(((skill, alias if isinstance(alias, str) else None)
+                          for skill, alias in zip(frame['Skill'], aliases)), tokenizer)
+
+    def to_disk(self, path, **meta):
+        """Save the compiled gazetteer with msgpack; meta is stored alongside, see from_disk()."""
+        srsly.write_msgpack(path, {'version': self.VERSION, 'meta': meta, 'skills': self.skills,
+                                   'phrases': self.phrases, 'prefixes': sorted(self.prefixes),
+                                   'cased': self.cased})
+
+    @classmethod
+    def from_disk(cls, path):
+        """
+        Load a gazetteer saved by to_disk().
+
+        Returns:
+            (SkillExtractor, meta dict)
+
+        Raises:
+            ValueError: If the file was saved by a different VERSION
+        """
+        loaded = srsly.read_msgpack(path)
+        if loaded.get('version') != cls.VERSION:
+            raise ValueError(f"Skill gazetteer version {loaded.get('version')} is not {cls.VERSION}")
+        return (cls(loaded['skills'], loaded['phrases'], set(loaded['prefixes']), loaded['cased']),
+                loaded['meta'])
+
+    def matches(self, tokens):
+        """
+        Return (skill, start, end) for each longest, non-overlapping alias in tokens,
+        with start and end offsets into the non-whitespace tokens.
+
+        Args:
+            tokens: Doc, Span or any sequence of spaCy tokens
+        """
+        tokens = [token for token in tokens if not token.is_space]
+        words = [token.lower_ for token in tokens]
+        phrases, prefixes, cased, separator = self.phrases, self.prefixes, self.cased, self.SEPARATOR
+        found = []
+        start = 0
+        while start < len(words):
+            key, end, match = words[start], start + 1, None
+            skill_id = cased.get(tokens[start].text)
+            if skill_id is not None:
+                match = (self.skills[skill_id], start, end)
+            while True:
+                skill_id = phrases.get(key)
+                if skill_id is not None:
+                    match = (self.skills[skill_id], start, end)
+                if end == len(words) or key not in prefixes:
+                    break
+                key += separator + words[end]
+                end += 1
+            if match is None:
+                start += 1
+            else:
+                found.append(match)
+                start = match[2]
+        return found
+
+    def extract(self, tokens):
+        """Return the distinct skills mentioned in tokens, in order of first mention."""
+        return list(dict.fromkeys(skill for skill, start, end in self.matches(tokens)))
@@ -0,0 +1,330 @@
+"""
+Resume Parser benchmark harness.
+
+Generates a synthetic corpus of resume PDFs offline with PyMuPDF and measures
+throughput, latency percentiles, per-stage timings, peak RSS and the memory
+retained per in-flight resume for each parsing mode. Results are written as JSON
+so runs on different commits can be compared.
+
+Usage:
+    python benchmark.py --count 200 --output bench.json
+    python benchmark.py --corpus ./bench_corpus --modes single,batch --n-process 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import traceback
+import tracemalloc
+
+import pandas as pd
+import pymupdf
+
+from ResumeParser import ResumeParser
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+MODES = ['single', 'fast', 'compact', 'batch', 'pipelined']
+
+FIRST_NAMES = ['John', 'Jane', 'Priya', 'Carlos', 'Mei', 'Ahmed', 'Olga', 'David', 'Amara', 'Lucas']
+LAST_NAMES = ['Smith', 'Doe', 'Sharma', 'Garcia', 'Chen', 'Hassan', 'Ivanova', 'Miller', 'Okafor', 'Silva']
+STREETS = ['Main Street', 'Oak Avenue', 'Pine Road', 'Maple Drive', 'Cedar Lane']
+CITIES = [('Austin', 'TX'), ('Seattle', 'WA'), ('Denver', 'CO'), ('Boston', 'MA'), ('Chicago', 'IL')]
+WORDS = ('designed built led maintained scalable services data pipelines team customers reliability '
+         'python java cloud deployment testing migration analytics platform performance api').split()
+
+
+def random_sentence(rng, length=12):
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def contact_lines(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, state = rng.choice(CITIES)
+    area, prefix, line = rng.randint(200, 989), rng.randint(200, 999), rng.randint(1000, 9999)
+    phone = rng.choice([f'({area}) {prefix}-{line}', f'{area}-{prefix}-{line}', f'{area} {prefix} {line}'])
+    email = rng.choice([f'{first}.{last}@example.com', f'{first[0]}{last}@mail.org', f'{last}{area}@example.net'])
+    lines = [f'{first} {last}', email.lower(), phone,
+             f'{rng.randint(10, 9999)} {rng.choice(STREETS)}, {city}, {state}']
+    if rng.random() < 0.5:
+        lines.append(f'https://github.com/{first.lower()}{last.lower()}')
+    if rng.random() < 0.5:
+        lines.append(f'https://www.linkedin.com/in/{first.lower()}-{last.lower()}')
+    return lines
+
+
+def resume_lines(rng, aliases, pages, sections):
+    """Return the text lines of one synthetic resume, roughly pages pages long."""
+    lines = contact_lines(rng) + ['']
+    chosen = rng.sample(list(aliases), min(sections, len(aliases)))
+    body_lines = max(pages * 45 - len(lines), len(chosen) * 4)
+    per_section = max(body_lines // max(len(chosen), 1), 3)
+    for section in chosen:
+        lines.append(rng.choice(aliases[section]))
+        for i in range(per_section - 1):
+            # blank-line runs separate WorkExperience entries, as get_work_experience expects
+            lines.extend(['', '', ''] if i and i % 8 == 0 else [random_sentence(rng)])
+        lines.append('')
+    return lines
+
+
+def write_pdf(path, lines):
+    document = pymupdf.open()
+    page, y = document.new_page(), 50
+    for line in lines:
+        if y > 790:
+            page, y = document.new_page(), 50
+        if line:
+            page.insert_text((50, y), line, fontsize=10)
+        y += 14
+    document.save(path)
+    document.close()
+
+
+def generate_corpus(directory, count, seed=0, pages=(1, 4), sections=(2, 6)):
+    """
+    Write count synthetic resume PDFs into directory.
+
+    Args:
+        directory: Output directory, created if missing
+        count: Number of resumes
+        seed: Random seed, the same seed always yields the same corpus
+        pages: (min, max) page count per resume
+        sections: (min, max) number of sections per resume
+
+    Returns:
+        List of generated file paths
+    """
+    rng = random.Random(seed)
+    section_dict = pd.read_csv(ResumeParser.section_info_path())
+    aliases = {section: list(section_dict[section].dropna(axis=0)) for section in ResumeParser.SECTION_TITLE[1:]}
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f'resume_{index:05d}.pdf')
+        lines = resume_lines(rng, aliases, rng.randint(*pages), rng.randint(*sections))
+        write_pdf(path, lines)
+        paths.append(path)
+    return paths
+
+
+def percentiles(values):
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None}
+    ordered = sorted(values)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {'p50': rank(0.50), 'p95': rank(0.95), 'p99': rank(0.99)}
+
+
+def describe(value, scale=1, unit=''):
+    """Format a measurement for the summary line; 'n/a' if it was not taken."""
+    return 'n/a' if value is None else f"{value * scale:.1f}{unit}"
+
+
+def parse_retained(mode, paths, options):
+    """Parse paths in the given mode and return what a caller would keep per resume."""
+    if mode in ('single', 'fast'):
+        kept = []
+        for path in paths:
+            parser = ResumeParser(path, fast=mode == 'fast')
+            parser.parse_information()
+            kept.append(parser)
+        return kept
+    if mode == 'compact':
+        return [ResumeParser.parse_compact(path) for path in paths]
+    if mode == 'batch':
+        results = ResumeParser.parse_many(paths, batch_size=options['batch_size'])
+    else:
+        results = ResumeParser.parse_pipelined(paths, extract_workers=options['extract_workers'],
+                                               batch_size=options['batch_size'])
+    return [details for path, details, error in results]
+
+
+def retained_bytes_per_doc(mode, paths, options):
+    """
+    Python heap bytes still held per resume once it is parsed, i.e. the memory cost
+    of each in-flight result. Measured with tracemalloc on a sample of paths.
+    """
+    sample = paths[:options['memory_sample']]
+    if not sample:
+        return None
+    ResumeParser.METRICS_HOOK = None
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = parse_retained(mode, sample, options)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (after - before) / len(sample)
+
+
+def run_mode(mode, paths, options):
+    """Run one benchmark mode in the current process and return its measurements."""
+    if options.get('model'):
+        ResumeParser.configure(model_name=options['model'])
+    ResumeParser.warmup()
+
+    stage_times = {}
+
+    def collect(stats):
+        for stage, timing in stats['stages'].items():
+            stage_times.setdefault(stage, []).append(timing['wall'])
+
+    ResumeParser.METRICS_HOOK = collect
+    latencies, failures = [], 0
+    start = last = time.perf_counter()
+
+    if mode in ('single', 'fast', 'compact'):
+        for path in paths:
+            try:
+                if mode == 'compact':
+                    ResumeParser.parse_compact(path)
+                else:
+                    ResumeParser(path, fast=mode == 'fast').parse_information()
+            except Exception:
+                failures += 1
+            now = time.perf_counter()
+            latencies.append(now - last)
+            last = now
+    else:
+        if mode == 'batch':
+            results = ResumeParser.parse_many(paths, batch_size=options['batch_size'],
+                                              n_process=options['n_process'])
+        else:
+            results = ResumeParser.parse_pipelined(paths, extract_workers=options['extract_workers'],
+                                                   n_process=options['n_process'],
+                                                   batch_size=options['batch_size'])
+        # for batch modes the latency is the interval between consecutive results
+        for path, details, error in results:
+            failures += error is not None
+            now = time.perf_counter()
+            latencies.append(now - last)
+            last = now
+
+    elapsed = time.perf_counter() - start
+    result = {
+        'mode': mode,
+        'docs': len(paths),
+        'failures': failures,
+        'seconds': elapsed,
+        'docs_per_sec': len(paths) / elapsed if elapsed else None,
+        'latency': percentiles(latencies),
+        'stages': {stage: dict(percentiles(times), total=sum(times)) for stage, times in stage_times.items()},
+        'max_rss_kb': None,
+        'retained_bytes_per_doc': retained_bytes_per_doc(mode, paths, options),
+    }
+    if resource is not None:
+        result['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result['children_max_rss_kb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return result
+
+
+def _run_child(connection, mode, paths, options):
+    try:
+        connection.send((True, run_mode(mode, paths, options)))
+    except Exception:
+        connection.send((False, traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def run_isolated(mode, paths, options):
+    # each mode gets a fresh interpreter so peak RSS is not inherited from earlier modes;
+    # a plain (non-daemon) Process is used because the batch modes start their own workers
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(sender, mode, paths, options))
+    process.start()
+    sender.close()
+    try:
+        ok, result = receiver.recv()
+    except EOFError:
+        ok, result = False, f'benchmark process exited with code {process.exitcode}'
+    process.join()
+    if not ok:
+        raise RuntimeError(f'{mode} benchmark failed:\n{result}')
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the resume parser on a synthetic corpus.')
+    parser.add_argument('--corpus', default='./bench_corpus', help='directory of the synthetic corpus')
+    parser.add_argument('--count', type=int, default=100, help='number of resumes to generate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-pages', type=int, default=4)
+    parser.add_argument('--modes', default=','.join(MODES), help='comma separated subset of ' + ', '.join(MODES))
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--extract-workers', type=int, default=4)
+    parser.add_argument('--memory-sample', type=int, default=20,
+                        help='resumes held at once to measure retained memory per document')
+    parser.add_argument('--model', default=None, help='spaCy model name or path')
+    parser.add_argument('--regenerate', action='store_true', help='rebuild the corpus even if it exists')
+    parser.add_argument('--no-isolate', action='store_true', help='run all modes in this process')
+    parser.add_argument('--output', default=None, help='write JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    paths = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+                   if name.endswith('.pdf')) if os.path.isdir(args.corpus) else []
+    if args.regenerate or len(paths) < args.count:
+        paths = generate_corpus(args.corpus, args.count, seed=args.seed, pages=(1, args.max_pages))
+    paths = paths[:args.count]
+
+    options = {'model': args.model, 'batch_size': args.batch_size, 'n_process': args.n_process,
+               'extract_workers': args.extract_workers, 'memory_sample': args.memory_sample}
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {'path': os.path.abspath(args.corpus), 'count': len(paths), 'seed': args.seed},
+        'options': options,
+        'modes': [],
+    }
+    for mode in modes:
+        run = run_mode if args.no_isolate else run_isolated
+        result = run(mode, paths, options)
+        results['modes'].append(result)
+        print(f"{mode:>10}: {describe(result['docs_per_sec'])} docs/s, "
+              f"p95 {describe(result['latency']['p95'], 1000, ' ms')}, "
+              f"{describe(result['retained_bytes_per_doc'], 1 / 1024, ' KiB')} retained/doc", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""
+Directory-scale resume parsing.
+
+Walks directories (or reads a file list), parses every resume with the
+pipelined batch runner and appends one JSON record per resume to a JSONL file.
+Completed files are recorded in a manifest next to the output, so a run that
+crashes can be restarted with the same command and only parses what is left.
+
+Usage:
+    python parse_resumes.py ./resumes --output results.jsonl --workers 4
+    python parse_resumes.py --file-list files.txt --output results.jsonl --parquet results.parquet
+    python parse_resumes.py ./resumes --output results.jsonl --timeout 30 --max-pages 10
+    python parse_resumes.py ./resumes --output results.jsonl --dedupe index.sqlite --dedupe-threshold 0.85
+    python parse_resumes.py ./resumes --output results.jsonl --index ./search_index
+    python parse_resumes.py ./resumes --output results.jsonl --docs docs.sqlite
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from ResumeParser import ResumeParser
+
+RESUME_EXTENSIONS = ResumeParser.EXTRACTORS.extensions()
+
+
+def find_resumes(inputs, file_list=None, extensions=RESUME_EXTENSIONS):
+    """
+    Yield resume paths from files and directories (walked recursively) in inputs,
+    then from file_list, a text file with one path per line.
+    """
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, dirs, files in os.walk(entry):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(extensions):
+                        yield os.path.join(root, name)
+        else:
+            yield entry
+
+    if file_list:
+        with open(file_list) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+
+class Manifest:
+    """
+    Append-only record of the files a run has finished, one JSON line per file.
+
+    Entries are held in memory and written by flush(), which the caller runs only
+    after the matching output records are on disk; a crash can at worst repeat a
+    record, never lose one.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a line cut short by a crash; that file is parsed again
+                        continue
+                    self.done[entry['path']] = entry['status']
+        self.pending = []
+        self.file = open(path, 'a')
+
+    def should_skip(self, path, retry_failed=False):
+        status = self.done.get(path)
+        return status in ('ok', 'truncated') or (status in ('failed', 'timeout') and not retry_failed)
+
+    def record(self, path, status):
+        self.done[path] = status
+        self.pending.append(json.dumps({'path': path, 'status': status}) + '\n')
+
+    def flush(self):
+        self.file.writelines(self.pending)
+        self.pending = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def record_schema():
+    """
+    Arrow schema of the JSONL records, so pyarrow does not have to guess the types of
+    fields that are null or missing in the first records it sees.
+    """
+    import pyarrow as pa
+
+    from ResultTable import ResultTable
+
+    strings = pa.list_(pa.string())
+    fields = dict.fromkeys(info['id'] for info in ResumeParser.CANDIDATE_INFO)
+    result = pa.struct([(ResumeParser.SECTION_TITLE[0], pa.struct([(name, pa.string()) for name in fields]))] +
+                       [(title, strings if title in (ResultTable.ENTRIES_SECTION, ResultTable.SKILLS_SECTION)
+                         else pa.string()) for title in ResultTable.DETAILS_SECTIONS])
+    return pa.schema([('path', pa.string()), ('status', pa.string()), ('result', result), ('error', pa.string()),
+                      ('duplicate_of', pa.string()), ('similarity', pa.float64()), ('truncated', strings),
+                      ('seconds', pa.float64())])
+
+
+def write_parquet(jsonl_path, parquet_path, experience_path=None):
+    """
+    Convert the JSONL output to Parquet in the columns of ResultTable, with the run's
+    bookkeeping (status, duplicate_of, ...) alongside, and optionally write the
+    exploded work experience table to experience_path.
+
+    pyarrow reads the records straight into columns. A path with more than one
+    record (resumed or --retry-failed runs append rather than rewrite) keeps only
+    its last one.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.json
+
+    from ResultTable import ResultTable
+
+    schema = record_schema()
+    if os.path.getsize(jsonl_path):
+        records = pyarrow.json.read_json(jsonl_path,
+                                         parse_options=pyarrow.json.ParseOptions(explicit_schema=schema))
+    else:
+        records = schema.empty_table()
+    positions = records.append_column('position', pa.array(np.arange(len(records))))
+    last = positions.group_by('path').aggregate([('position', 'max')]).column('position_max')
+    records = records.take(np.sort(last.to_numpy()))
+
+    table = ResultTable.from_arrow(records)
+    extra = records.drop_columns(['path', 'result', 'error']).to_pandas()
+    table.resumes = pd.concat([table.resumes, extra], axis=1)
+    table.to_parquet(parquet_path, experience_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Parse a directory of resumes into JSONL, resumably.')
+    parser.add_argument('inputs', nargs='*', help='resume files or directories to walk')
+    parser.add_argument('--file-list', help='text file with one resume path per line')
+    parser.add_argument('--output', required=True, help='JSONL file records are appended to')
+    parser.add_argument('--manifest', help='progress manifest, defaults to <output>.manifest')
+    parser.add_argument('--parquet', help='also write the results to this Parquet file at the end')
+    parser.add_argument('--experience-parquet', help='with --parquet, also write one row per work experience entry')
+    parser.add_argument('--index', help='directory of a ResumeIndex the parsed results are added to')
+    parser.add_argument('--workers', type=int, default=1, help='processes for the spaCy work')
+    parser.add_argument('--extract-workers', type=int, default=4, help='threads for PDF extraction')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--fast', action='store_true', help='tokenizer-only segmentation, see ResumeParser')
+    parser.add_argument('--model', help='spaCy model name or path')
+    parser.add_argument('--cache', help='sqlite file for a ParseCache shared across runs')
+    parser.add_argument('--dedupe', help='sqlite file of a DuplicateIndex; near-duplicates of resumes parsed '
+                                          'before reuse that result and are marked with duplicate_of')
+    parser.add_argument('--dedupe-threshold', type=float, default=0.9,
+                        help='estimated Jaccard similarity from which two resumes count as duplicates')
+    parser.add_argument('--docs', help='sqlite file of a DocStore that keeps each Doc, so heading changes can be '
+                                        'applied later with resegment.py')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='parse files that failed or timed out in an earlier run again')
+    parser.add_argument('--timeout', type=float,
+                        help='seconds per resume; runs --workers guarded worker processes that are killed and '
+                             'replaced on overrun (see ResumeParser.parse_guarded)')
+    parser.add_argument('--max-pages', type=int, help='read at most this many pages per resume')
+    parser.add_argument('--max-chars', type=int, help='read at most this many characters per resume')
+    parser.add_argument('--max-tokens', type=int, help='send at most this many tokens per resume through spaCy')
+    parser.add_argument('--progress-every', type=float, default=10.0, help='seconds between progress lines')
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.file_list:
+        parser.error('give at least one input path or --file-list')
+    if args.model:
+        ResumeParser.configure(model_name=args.model)
+    ResumeParser.MAX_PAGES = args.max_pages
+    ResumeParser.MAX_CHARS = args.max_chars
+    ResumeParser.MAX_TOKENS = args.max_tokens
+    if args.timeout is not None and (args.cache or args.dedupe or args.docs):
+        parser.error('--cache, --dedupe and --docs are not supported together with --timeout')
+
+    cache = None
+    if args.cache:
+        from ParseCache import ParseCache
+        cache = ParseCache(args.cache)
+    duplicates = None
+    if args.dedupe:
+        from DuplicateIndex import DuplicateIndex
+        duplicates = DuplicateIndex(args.dedupe, threshold=args.dedupe_threshold)
+    doc_store = None
+    if args.docs:
+        from DocStore import DocStore
+        doc_store = DocStore(args.docs)
+
+    index = None
+    if args.index:
+        from ResumeIndex import ResumeIndex
+        index = ResumeIndex(args.index)
+    index_pending = []
+
+    def flush_index():
+        # runs before the manifest is flushed, so an indexed file is never skipped unindexed
+        if index is not None and index_pending:
+            index.add(index_pending)
+            index.save()
+            index_pending.clear()
+
+    manifest = Manifest(args.manifest or args.output + '.manifest')
+    skipped = 0
+
+    def pending():
+        nonlocal skipped
+        for path in find_resumes(args.inputs, args.file_list):
+            if manifest.should_skip(path, args.retry_failed):
+                skipped += 1
+                continue
+            yield path
+
+    parsed = failed = timed_out = 0
+    start = last_report = time.perf_counter()
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        rate = (parsed + failed + timed_out) / elapsed if elapsed else 0.0
+        print(f"{'done' if final else 'progress'}: {parsed} parsed, {failed} failed, {timed_out} timed out, "
+              f"{skipped} skipped, {rate:.1f} docs/s, {elapsed:.0f}s", file=sys.stderr)
+
+    if args.timeout is not None:
+        records = ResumeParser.parse_guarded(pending(), timeout=args.timeout, workers=args.workers, fast=args.fast)
+    else:
+        def pipelined():
+            for path, details, error in ResumeParser.parse_pipelined(
+                    pending(), extract_workers=args.extract_workers, n_process=args.workers,
+                    batch_size=args.batch_size, fast=args.fast, cache=cache, duplicates=duplicates,
+                    doc_store=doc_store):
+                if error is None:
+                    record = {'path': path, 'status': 'ok', 'result': details}
+                else:
+                    record = {'path': path, 'status': 'failed', 'error': str(error)}
+                if duplicates is not None and path in duplicates.matches:
+                    record['duplicate_of'], record['similarity'] = duplicates.matches.pop(path)
+                yield record
+
+        records = pipelined()
+    try:
+        with open(args.output, 'a') as output:
+            for record in records:
+                path = record['path']
+                if record['status'] in ('ok', 'truncated'):
+                    parsed += 1
+                elif record['status'] == 'timeout':
+                    timed_out += 1
+                else:
+                    failed += 1
+                output.write(json.dumps(record) + '\n')
+                manifest.record(path, record['status'])
+                if index is not None and record.get('result') is not None:
+                    index_pending.append((path, record['result']))
+
+                now = time.perf_counter()
+                if now - last_report >= args.progress_every:
+                    output.flush()
+                    os.fsync(output.fileno())
+                    flush_index()
+                    manifest.flush()
+                    report()
+                    last_report = now
+            output.flush()
+            os.fsync(output.fileno())
+    finally:
+        # the output file is closed (flushed) before the manifest entries are written
+        flush_index()
+        manifest.close()
+        if cache is not None:
+            cache.close()
+        if duplicates is not None:
+            duplicates.close()
+        if doc_store is not None:
+            doc_store.close()
+
+    report(final=True)
+    if args.parquet:
+        write_parquet(args.output, args.parquet, args.experience_parquet)
+    return 1 if failed or timed_out else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
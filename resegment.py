@@ -0,0 +1,65 @@
+"""
+Apply heading alias changes to resumes parsed earlier.
+
+Reads the Docs a run kept with --docs (see parse_resumes.py), builds the heading
+matcher from the current section CSV and segments again only the resumes whose
+text contains an alias that was added, removed or moved since they were last
+segmented. No resume is extracted or sent through the spaCy pipeline again.
+Updated results are kept in the store and optionally written as JSONL records.
+
+Usage:
+    python resegment.py --docs docs.sqlite
+    python resegment.py --docs docs.sqlite --output resegmented.jsonl
+    python resegment.py --docs docs.sqlite --force
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from DocStore import DocStore
+from ResumeParser import ResumeParser
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-segment stored resumes after the section headings changed.')
+    parser.add_argument('--docs', required=True, help='sqlite file of the DocStore written by parse_resumes.py')
+    parser.add_argument('--output', help='JSONL file the updated records are appended to')
+    parser.add_argument('--model', help='spaCy model name or path; must be the one the Docs were made with')
+    parser.add_argument('--sections', help='section heading CSV, defaults to ResumeParser.SECTION_INFO_FILE')
+    parser.add_argument('--force', action='store_true', help='re-segment every stored resume')
+    args = parser.parse_args(argv)
+
+    if args.model:
+        ResumeParser.configure(model_name=args.model)
+    if args.sections:
+        ResumeParser.SECTION_INFO_FILE = args.sections
+
+    store = DocStore(args.docs)
+    total = len(store)
+    updated = failed = 0
+    start = time.perf_counter()
+    output = open(args.output, 'a') if args.output else None
+    try:
+        for path, details, error in ResumeParser.resegment(store, force=args.force):
+            if error is None:
+                updated += 1
+                record = {'path': path, 'status': 'ok', 'result': details}
+            else:
+                failed += 1
+                record = {'path': path, 'status': 'failed', 'error': str(error)}
+            if output is not None:
+                output.write(json.dumps(record) + '\n')
+    finally:
+        if output is not None:
+            output.close()
+        store.close()
+
+    print(f"done: {updated} re-segmented, {failed} failed, {total} stored, "
+          f"{time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
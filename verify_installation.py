@@ -153,6 +153,37 @@ except Exception as e:
     print("❌ Pattern matching setup FAILED: {}".format(str(e)))
     test_results.append(False)
 
+# Test 8: Test contact extraction
+print("\n📋 TEST 8: Testing Contact Extraction")
+print("-" * 70)
+
+try:
+    from ResumeParser import ContactExtractor
+    # a phone number must not run on into the digits that start the next line
+    cases = [
+        ('+44 20 7946 0958\n221 Baker Street', '+44 20 7946 0958'),
+        ('+1 (555) 123-4567\n2019 - 2021', '+1 (555) 123-4567'),
+        ('Phone: (555) 123-4567', '(555) 123-4567'),
+        ('Phone: 555.123.4567', '555.123.4567'),
+    ]
+    failures = 0
+    for text, expected in cases:
+        phone = ContactExtractor.extract(text)['Phone']
+        if phone == expected:
+            print("   ✓ {!r} -> {!r}".format(text, phone))
+        else:
+            failures += 1
+            print("   ✗ {!r} -> {!r}, expected {!r}".format(text, phone, expected))
+    if failures:
+        print("❌ Contact extraction FAILED for {} case(s)".format(failures))
+        test_results.append(False)
+    else:
+        print("✅ Contact extraction working correctly")
+        test_results.append(True)
+except Exception as e:
+    print("❌ Contact extraction FAILED: {}".format(str(e)))
+    test_results.append(False)
+
 # Summary
 print("\n" + "="*70)
 print("TEST SUMMARY")